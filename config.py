@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 # ---------------------------------------------------------------------------
 # Runtime constants
 # ---------------------------------------------------------------------------
@@ -16,6 +19,10 @@ READING_TIMEOUT = 30  # seconds
 # LLM settings — temperature 0.0 gives deterministic, consistent classifications.
 LLM_MODEL = "gpt-4o-mini"
 LLM_TEMPERATURE = 0.5
+# Model for the pure classifiers (questionnaire answers, retry/give up), which
+# only ever reply with a label. A smaller, faster model can be swapped in here
+# without affecting the conversational replies.
+LLM_CLASSIFIER_MODEL = LLM_MODEL
 
 # ---------------------------------------------------------------------------
 # PAGE_CONFIG – single source of all static strings
@@ -211,3 +218,37 @@ PAGE_CONFIG = {
         "action_context": "deciding whether to retry the failed device reading",
     },
 }
+
+
+# ---------------------------------------------------------------------------
+# STAGES – PAGE_CONFIG compiled into slotted, read-only records
+#
+# PAGE_CONFIG stays the place to edit strings; STAGES is derived from it at
+# import so the run loop reads fixed attributes (cfg.message, cfg.page_id_int)
+# instead of nested dict lookups with defaults.
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class StageConfig:
+    page_id: str
+    page_id_int: int
+    message: str
+    speech: str  # what the robot says on entry ("speech" if set, else message)
+    action_context: str
+    options: Optional[Tuple[str, ...]] = None
+    location: str = ""
+    video_id: str = ""
+
+
+STAGES = {
+    stage: StageConfig(
+        page_id=cfg["page_id"],
+        page_id_int=int(cfg["page_id"]),
+        message=cfg["message"],
+        speech=cfg.get("speech", cfg["message"]),
+        action_context=cfg["action_context"],
+        options=tuple(cfg["options"]) if "options" in cfg else None,
+        location=cfg.get("location", ""),
+        video_id=cfg.get("video_id", ""),
+    )
+    for stage, cfg in PAGE_CONFIG.items()
+}
@@ -9,14 +9,45 @@ External devices push readings onto `device_queue` as dicts:
 
 In production, replace `simulate_reading()` with your real hardware integration
 and remove the call to it in robot.py's `_do_device_reading()`.
+
+Real BLE readings run on the app's shared asyncio event loop (the one the
+WebSocket server already runs on) rather than spinning up a fresh loop per
+reading with asyncio.run(). If that server isn't running, a private loop
+is started once in a background thread and reused for every reading.
 """
 
-import queue
+import asyncio
 import random
 import threading
 
+import ws_server
+from event_queue import EventQueue
+
+try:
+    from sensors import sensor_blood_pressure, sensor_height, sensor_oximeter, sensor_scales
+except ImportError as e:  # BLE stack not installed; dummy mode still works
+    _SENSOR_IMPORT_ERROR = e
+else:
+    _SENSOR_IMPORT_ERROR = None
+
 # Module-level queue shared across the whole app
-device_queue: queue.Queue = queue.Queue()
+device_queue: EventQueue = EventQueue()
+
+_own_loop: asyncio.AbstractEventLoop = None
+_own_loop_lock = threading.Lock()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared WebSocket loop, or a private loop thread started on first use."""
+    global _own_loop
+    loop = ws_server.event_loop()
+    if loop is not None:
+        return loop
+    with _own_loop_lock:
+        if _own_loop is None:
+            _own_loop = asyncio.new_event_loop()
+            threading.Thread(target=_own_loop.run_forever, daemon=True).start()
+    return _own_loop
 
 
 def _generate_value(device: str):
@@ -38,13 +69,22 @@ def simulate_reading(device: str, delay: float = 2.0):
     """
     Push a fake reading onto device_queue after `delay` seconds.
     Only used in dummy mode.
+
+    Scheduled with call_later on the event loop, so no thread is created
+    per reading.
     """
 
     def _push():
         value = _generate_value(device)
         device_queue.put({"device": device, "value": value})
 
-    threading.Timer(delay, _push).start()
+    loop = _event_loop()
+    loop.call_soon_threadsafe(loop.call_later, delay, _push)
+
+
+def _run(coro):
+    """Run a sensor coroutine on the event loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
 
 
 def get_real_reading(device: str):
@@ -58,36 +98,52 @@ def get_real_reading(device: str):
         bp       → {"device": "bp",       "value": "systolic/diastolic"}
         scale    → {"device": "scale",    "value": float}
     """
-    import asyncio
+    return _run(read_device(device))
 
-    if device == "oximeter":
-        from sensors import sensor_oximeter as mod
-        raw = asyncio.run(mod.get_reading())
-        if raw is None:
-            return None
-        return {"device": "oximeter", "value": {"hr": raw["pulse"], "spo2": raw["spo2"]}}
 
-    elif device == "bp":
-        from sensors import sensor_blood_pressure as mod
-        raw = asyncio.run(mod.get_reading())
-        if raw is None:
-            return None
-        systolic = int(round(raw["systolic"]))
-        diastolic = int(round(raw["diastolic"]))
-        return {"device": "bp", "value": f"{systolic}/{diastolic}"}
+async def _read_oximeter():
+    raw = await sensor_oximeter.get_reading()
+    if raw is None:
+        return None
+    return {"device": "oximeter", "value": {"hr": raw["pulse"], "spo2": raw["spo2"]}}
 
-    elif device == "scale":
-        from sensors import sensor_scales as mod
-        raw = asyncio.run(mod.get_reading())
-        if raw is None:
-            return None
-        return {"device": "scale", "value": raw}
 
-    elif device == "height":
-        from sensors import sensor_height as mod
-        raw = asyncio.run(mod.get_reading())
-        if raw is None:
-            return None
-        return {"device": "height", "value": raw}
+async def _read_bp():
+    raw = await sensor_blood_pressure.get_reading()
+    if raw is None:
+        return None
+    systolic = int(round(raw["systolic"]))
+    diastolic = int(round(raw["diastolic"]))
+    return {"device": "bp", "value": f"{systolic}/{diastolic}"}
 
-    return None
+
+async def _read_scale():
+    raw = await sensor_scales.get_reading()
+    if raw is None:
+        return None
+    return {"device": "scale", "value": raw}
+
+
+async def _read_height():
+    raw = await sensor_height.get_reading()
+    if raw is None:
+        return None
+    return {"device": "height", "value": raw}
+
+
+_READERS = {
+    "oximeter": _read_oximeter,
+    "bp": _read_bp,
+    "scale": _read_scale,
+    "height": _read_height,
+}
+
+
+async def read_device(device: str):
+    """Coroutine form of get_real_reading(); awaits the sensor directly."""
+    reader = _READERS.get(device)
+    if reader is None:
+        return None
+    if _SENSOR_IMPORT_ERROR is not None:
+        raise _SENSOR_IMPORT_ERROR
+    return await reader()
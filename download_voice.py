@@ -7,7 +7,10 @@ Files downloaded:
 """
 
 import os
+import shutil
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 VOICES_DIR = os.path.join(os.path.dirname(__file__), "voices")
 BASE_URL = (
@@ -18,23 +21,65 @@ FILES = [
     "en_GB-alba-medium.onnx",
     "en_GB-alba-medium.onnx.json",
 ]
+CHUNK_SIZE = 1 << 20  # 1 MB read/write buffer
+
+
+def _expected_size(resp, offset: int):
+    """Return the full file size advertised by the server, or None if unknown."""
+    content_range = resp.headers.get("Content-Range")  # "bytes start-end/total"
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    length = resp.headers.get("Content-Length")
+    return offset + int(length) if length else None
 
 
 def _download(filename: str) -> None:
+    """Stream `filename` into ./voices/, resuming a partial .part download if present."""
     url = f"{BASE_URL}/{filename}"
     dest = os.path.join(VOICES_DIR, filename)
     if os.path.isfile(dest):
         print(f"  already exists, skipping: {filename}")
         return
-    print(f"  downloading {filename} ...", end="", flush=True)
-    urllib.request.urlretrieve(url, dest)
-    size_mb = os.path.getsize(dest) / 1_048_576
-    print(f" done ({size_mb:.1f} MB)")
+    part = dest + ".part"
+    offset = os.path.getsize(part) if os.path.isfile(part) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    print(f"  downloading {filename} ...")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as resp:
+            # 206 means the server honoured the Range header; otherwise start over.
+            if resp.status != 206:
+                offset = 0
+            expected = _expected_size(resp, offset)
+            with open(part, "ab" if offset else "wb") as f:
+                shutil.copyfileobj(resp, f, length=CHUNK_SIZE)
+    except urllib.error.HTTPError as e:
+        # 416: the range starts at or past the end of the file. That means the
+        # .part file is complete only if it is exactly the advertised size
+        # ("bytes */N"); otherwise it is stale or corrupt, so start over.
+        if e.code != 416:
+            raise
+        content_range = e.headers.get("Content-Range", "")
+        total = content_range.rsplit("/", 1)[1] if "/" in content_range else ""
+        if not total.isdigit() or os.path.getsize(part) != int(total):
+            print(f"  discarding unusable partial download: {filename}")
+            os.remove(part)
+            return _download(filename)
+        expected = int(total)
+    size = os.path.getsize(part)
+    if expected is not None and size != expected:
+        raise RuntimeError(
+            f"incomplete download of {filename}: {size} of {expected} bytes "
+            f"(re-run to resume)"
+        )
+    os.replace(part, dest)
+    print(f"  done: {filename} ({size / 1_048_576:.1f} MB)")
 
 
 if __name__ == "__main__":
     os.makedirs(VOICES_DIR, exist_ok=True)
     print(f"Saving voice model to: {VOICES_DIR}")
-    for f in FILES:
-        _download(f)
+    # The files are independent, so fetch them concurrently.
+    with ThreadPoolExecutor(max_workers=len(FILES)) as pool:
+        list(pool.map(_download, FILES))
     print("Alba voice ready. Run with: python main.py --tts local")
@@ -0,0 +1,87 @@
+"""
+EventQueue – a minimal multi-producer / single-consumer queue.
+
+Backed by collections.deque (append/popleft are atomic under the GIL) plus a
+threading.Event that is set while items are waiting. Producers never take a
+lock, and the consumer sleeps in Event.wait() rather than on the
+Condition-variable dance queue.Queue performs on every put/get.
+
+Implements the subset of queue.Queue the app uses — put(), get(timeout),
+get_nowait(), empty() — and raises queue.Empty the same way. drain() takes
+everything queued in one pass. wake() interrupts a blocked get() so the
+consumer can react to something other than a new item (e.g. a reset).
+"""
+
+import collections
+import queue
+import threading
+import time
+
+
+class EventQueue:
+    def __init__(self):
+        self._items = collections.deque()
+        self._ready = threading.Event()
+        self._woken = False
+
+    def put(self, item) -> None:
+        self._items.append(item)
+        self._ready.set()
+
+    def get_nowait(self):
+        try:
+            item = self._items.popleft()
+        except IndexError:
+            raise queue.Empty from None
+        if not self._items:
+            self._ready.clear()
+            # A producer may have appended between the check and the clear.
+            if self._items:
+                self._ready.set()
+        return item
+
+    def wake(self) -> None:
+        """Make a blocked get() — or the next one — raise queue.Empty.
+
+        Queued items are still returned first; the wake only fires once the
+        queue is empty.
+        """
+        self._woken = True
+        self._ready.set()
+
+    def get(self, timeout: float = None):
+        """Block until an item is available (or `timeout` seconds pass, or
+        wake() is called → queue.Empty)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            if self._woken:
+                self._woken = False
+                self._ready.clear()
+                if self._items:
+                    self._ready.set()
+                raise queue.Empty
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self._ready.wait(remaining)
+
+    def drain(self) -> list:
+        """Remove and return every queued item in one pass (possibly none)."""
+        items = []
+        popleft = self._items.popleft
+        while True:
+            try:
+                items.append(popleft())
+            except IndexError:
+                break
+        self._ready.clear()
+        if self._items:
+            self._ready.set()
+        return items
+
+    def empty(self) -> bool:
+        return not self._items
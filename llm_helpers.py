@@ -2,20 +2,263 @@
 LLMHelper – wraps all LLM calls in one place.
 
 Every method takes plain strings and returns a plain Python value so the
-rest of the app never has to touch LangChain objects directly.
+rest of the app never has to touch API objects directly. Calls go straight
+through the OpenAI SDK; the prompts are plain chat-message dicts.
 """
 
-from typing import Optional, Tuple
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+import httpx
+from openai import OpenAI
 
-from config import LLM_MODEL, LLM_TEMPERATURE, PAGE_CONFIG
+from config import LLM_CLASSIFIER_MODEL, LLM_MODEL, LLM_TEMPERATURE, PAGE_CONFIG
+
+
+# Keep-alive connection pool for the API client, so the classifier and
+# conversational calls reuse the same TLS connection.
+_HTTP_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+)
+
+# Longest classifier reply is an option label (~15 tokens); cap decoding there.
+CLASSIFIER_MAX_TOKENS = 32
+
+Message = Dict[str, str]
+
+# Classifications remembered per LLMHelper, keyed on the normalised input.
+_CACHE_SIZE = 512
+
+_MISS = object()
+
+
+# ---------------------------------------------------------------------------
+# Prompt text. Everything that doesn't vary per call is built once here.
+# ---------------------------------------------------------------------------
+
+_PROCEED_PREFIX = "You are HeartPod, a friendly digital health assistant.\n"
+_PROCEED_RULES = (
+    "Decide whether the user's response is POSITIVE or NEGATIVE in sentiment.\n"
+    "Do not be overly strict, as the user will reply in natural language and talk casually / informally.\n"
+    "Do NOT ask for further confirmation if the user reply is 'OK' or if you think there is even a small chance that the user is confirming.\n"
+    "A POSITIVE response means they are willing, ready, agreeing, or consenting.\n"
+    "A NEGATIVE response means they are unwilling, confused, asking a question,\n"
+    "or explicitly declining.\n\n"
+    "OUTPUT RULES:\n"
+    "- If POSITIVE: reply with ONLY the single word: PROCEED\n"
+    "- If NEGATIVE: if the user is asking a question or making a comment which is relevant to the health screening,\n"
+    "  briefly assist them, then gently remind them about the current step.\n"
+    "  Do NOT begin your response with the word PROCEED."
+)
+
+# Static, so the system prompt is byte-identical on every turn; the robot's
+# message and the current step go in the user message instead.
+_PROCEED_SYSTEM: Message = dict(
+    role="system",
+    content=(
+        _PROCEED_PREFIX
+        + "You will be given what the robot just said (if anything), the step "
+        "the user is being asked to complete, and the user's reply.\n\n"
+        + _PROCEED_RULES
+    )
+)
+
+_QUESTIONNAIRE_RULES = (
+    "Determine what the user intends:\n\n"
+    "1. SKIP — they want to skip (indicators: skip, pass, next, move on,\n"
+    "   I'd rather not, prefer not to say, no thanks, not sure, etc.)\n"
+    "2. ANSWER — their response maps to one of the options above\n"
+    "   (by number, keyword, or meaning — e.g. 'I do pilates twice a week.'\n"
+    "   'I do housework' → 'Light'. Try to understand that the examples we give\n"
+    "    are just that, examples. Consider other relevant examples.\n"
+    "    Example: 'I run' → 'Moderate'\n"
+    "3. UNCLEAR — ambiguous, off-topic, or genuinely unmatchable\n\n"
+    "OUTPUT RULES:\n"
+    "- If SKIP: reply with only the word SKIP\n"
+    "- If ANSWER: reply with only the exact matching option text from the list\n"
+    "- If UNCLEAR: reply with only the word UNCLEAR"
+)
+
+_OPTIONS_TEXT = {
+    key: "\n".join(f"  {i+1}. {o}" for i, o in enumerate(cfg["options"]))
+    for key, cfg in PAGE_CONFIG.items()
+    if "options" in cfg
+}
+
+# (question_key, question_text) → system message; the questions are fixed, so
+# this holds at most a handful of entries.
+_questionnaire_systems: Dict[Tuple[str, str], Message] = {}
+
+
+def _questionnaire_system(question_key: str, question_text: str) -> Message:
+    """Return the (shared) system prompt for a questionnaire question."""
+    key = (question_key, question_text)
+    msg = _questionnaire_systems.get(key)
+    if msg is None:
+        question_context = (
+            f'The question: "{question_text}"\n\n' if question_text else ""
+        )
+        msg = dict(
+            role="system",
+            content=(
+                "You are processing a user's response to a health questionnaire question.\n"
+                + question_context
+                + f"The answer options are:\n{_OPTIONS_TEXT[question_key]}\n\n"
+                + _QUESTIONNAIRE_RULES
+            )
+        )
+        _questionnaire_systems[key] = msg
+    return msg
+
+
+_RETRY_SYSTEM: Message = dict(
+    role="system",
+    content=(
+        "The user was asked whether they want to retry a failed device reading "
+        "or give up and finish the session.\n"
+        "Reply with ONLY 'YES' if they want to try again, "
+        "or 'NO' if they want to stop."
+    )
+)
+
+# ---------------------------------------------------------------------------
+# Keyword fast paths. Button presses arrive as fixed phrases (see
+# ws_server._ACTION_TEXT) and tapped answers as the exact option text, so
+# these inputs are classified without an LLM round trip. Anything else —
+# free speech — still goes to the model.
+#
+# Input is compared after _normalize(): lowercase, with runs of anything
+# other than letters and digits collapsed to one space ("OK." → "ok").
+# ---------------------------------------------------------------------------
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+_PROCEED_WORDS = frozenset(
+    ("yes", "yeah", "yep", "y", "ok", "okay", "sure", "ready", "continue",
+     "begin", "start", "go", "go ahead", "proceed", "lets go", "let s go",
+     "alright", "all right", "agree", "i agree", "accept", "yes please",
+     "i m ready", "im ready", "done", "start self screening")
+)
+_SKIP_WORDS = frozenset(
+    ("skip", "skip it", "skip this", "skip this question", "pass", "next",
+     "next question", "move on", "no thanks", "no thank you",
+     "prefer not to say", "i d rather not say", "id rather not say")
+)
+_RETRY_WORDS = frozenset(
+    ("retry", "try again", "again", "yes", "yeah", "ok", "okay", "sure")
+)
+_GIVE_UP_WORDS = frozenset(
+    ("no", "nope", "no thanks", "no thank you", "done", "stop", "quit",
+     "finish", "give up")
+)
+
+# question_key → {lowercased option text: option text}, in option order
+_OPTION_LOOKUP = {
+    key: {o.lower(): o for o in cfg["options"]}
+    for key, cfg in PAGE_CONFIG.items()
+    if "options" in cfg
+}
+
+_NUMBER_WORDS = ("one", "two", "three", "four", "five", "six")
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\.\s*(.+?)\s*$", re.MULTILINE)
+
+
+def _answer_index(cfg: dict) -> Dict[str, str]:
+    """Map every normalised way of picking an option to the option text.
+
+    Covers the option text itself, its number ("option 2", and "2" /
+    "two" unless the options mention quantities of their own), and the
+    short label shown next to that number in the question message
+    ("2. No" → "no").
+    """
+    options = cfg["options"]
+    # "one" in answer to "how many hours?" is an amount, not option 1
+    bare_numbers = not any(ch.isdigit() for option in options for ch in option)
+    index = {}
+    for n, label in _NUMBERED_LINE.findall(cfg["message"]):
+        if 1 <= int(n) <= len(options):
+            index[_normalize(label)] = options[int(n) - 1]
+    for i, option in enumerate(options):
+        number = str(i + 1)
+        index[f"option {number}"] = option
+        index[f"number {number}"] = option
+        if bare_numbers:
+            index[number] = option
+            index[_NUMBER_WORDS[i]] = option
+        index[_normalize(option)] = option
+    return index
+
+
+_ANSWER_INDEX = {
+    key: _answer_index(cfg) for key, cfg in PAGE_CONFIG.items() if "options" in cfg
+}
+
+
+def _match_questionnaire_reply(
+    reply: str, question_key: str
+) -> Tuple[str, Optional[str]]:
+    """Turn the classifier's reply into ("skip"|"answer"|"unclear", option)."""
+    result = reply.strip()
+    upper = result.upper()
+    if upper == "SKIP":
+        return "skip", None
+    if upper == "UNCLEAR":
+        return "unclear", None
+    result_lc = result.lower()
+    for opt_lc, opt in _OPTION_LOOKUP[question_key].items():
+        if opt_lc in result_lc or result_lc in opt_lc:
+            return "answer", opt
+    return "unclear", None
 
 
 class LLMHelper:
     def __init__(self):
-        self._llm = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
+        self._client = OpenAI(http_client=_HTTP_CLIENT)
+        # (method, context..., normalised input) → result, least recently
+        # used first. Speech and button threads both call in, hence the lock.
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _chat(self, messages: List[Message]) -> str:
+        """Conversational call: may write the follow-up in evaluate_proceed()."""
+        response = self._client.chat.completions.create(
+            model=LLM_MODEL, temperature=LLM_TEMPERATURE, messages=messages
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    def _classify(
+        self, messages: List[Message], max_tokens: int = CLASSIFIER_MAX_TOKENS
+    ) -> str:
+        """Deterministic, short-output call for the pure classifiers."""
+        response = self._client.chat.completions.create(
+            model=LLM_CLASSIFIER_MODEL,
+            temperature=0,
+            max_completion_tokens=max_tokens,
+            messages=messages,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    def _cached(self, key: tuple) -> Any:
+        """Return the remembered result for `key`, or _MISS."""
+        with self._cache_lock:
+            result = self._cache.get(key, _MISS)
+            if result is not _MISS:
+                self._cache.move_to_end(key)
+            return result
+
+    def _remember(self, key: tuple, result: Any) -> None:
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
 
     def evaluate_proceed(
         self, user_input: str, action_context: str, robot_message: str = ""
@@ -24,33 +267,31 @@ class LLMHelper:
         Classify user intent and generate a response if they are not ready.
         Returns (should_proceed, follow_up_message_or_None).
         """
+        said = _normalize(user_input)
+        if said in _PROCEED_WORDS:
+            return True, None
+        # Only "proceed" is remembered; a follow-up reply is written afresh
+        # each time so a user repeating themselves isn't answered verbatim.
+        key = ("proceed", action_context, robot_message, said)
+        if self._cached(key) is not _MISS:
+            return True, None
         robot_context = (
             f'The robot just said:\n  "{robot_message}"\n\n' if robot_message else ""
         )
         messages = [
-            SystemMessage(
+            _PROCEED_SYSTEM,
+            dict(
+                role="user",
                 content=(
-                    "You are HeartPod, a friendly digital health assistant.\n"
-                    f"{robot_context}"
-                    f"The user was being asked to: {action_context}\n\n"
-                    "Decide whether the user's response is POSITIVE or NEGATIVE in sentiment.\n"
-                    "Do not be overly strict, as the user will reply in natural language and talk casually / informally.\n"
-                    "Do NOT ask for further confirmation if the user reply is 'OK' or if you think there is even a small chance that the user is confirming.\n"
-                    "A POSITIVE response means they are willing, ready, agreeing, or consenting.\n"
-                    "A NEGATIVE response means they are unwilling, confused, asking a question,\n"
-                    "or explicitly declining.\n\n"
-                    "OUTPUT RULES:\n"
-                    "- If POSITIVE: reply with ONLY the single word: PROCEED\n"
-                    "- If NEGATIVE: if the user is asking a question or making a comment which is relevant to the health screening,\n"
-                    "  briefly assist them, then gently remind them about the current step.\n"
-                    "  Do NOT begin your response with the word PROCEED."
-                )
+                    robot_context
+                    + f"The user was being asked to: {action_context}\n\n"
+                    + f"User said: {user_input}"
+                ),
             ),
-            HumanMessage(content=f"User said: {user_input}"),
         ]
-        response = self._llm.invoke(messages)
-        text = response.content.strip()
+        text = self._chat(messages)
         if text.upper() == "PROCEED":
+            self._remember(key, True)
             return True, None
         return False, text
 
@@ -61,61 +302,42 @@ class LLMHelper:
         Determine if the user is skipping, answering, or unclear.
         Returns ("skip", None) | ("answer", matched_option) | ("unclear", None).
         """
-        options = PAGE_CONFIG[question_key]["options"]
-        options_text = "\n".join(f"  {i+1}. {o}" for i, o in enumerate(options))
-        question_context = (
-            f'The question: "{question_text}"\n\n' if question_text else ""
-        )
+        said = _normalize(user_input)
+        if said in _SKIP_WORDS:
+            return "skip", None
+        option = _ANSWER_INDEX[question_key].get(said)
+        if option is not None:
+            return "answer", option
+
+        key = ("questionnaire", question_key, said)
+        cached = self._cached(key)
+        if cached is not _MISS:
+            return cached
+
         messages = [
-            SystemMessage(
-                content=(
-                    "You are processing a user's response to a health questionnaire question.\n"
-                    f"{question_context}"
-                    f"The answer options are:\n{options_text}\n\n"
-                    "Determine what the user intends:\n\n"
-                    "1. SKIP — they want to skip (indicators: skip, pass, next, move on,\n"
-                    "   I'd rather not, prefer not to say, no thanks, not sure, etc.)\n"
-                    "2. ANSWER — their response maps to one of the options above\n"
-                    "   (by number, keyword, or meaning — e.g. 'I do pilates twice a week.'\n"
-                    "   'I do housework' → 'Light'. Try to understand that the examples we give\n"
-                    "    are just that, examples. Consider other relevant examples.\n"
-                    "    Example: 'I run' → 'Moderate'\n"
-                    "3. UNCLEAR — ambiguous, off-topic, or genuinely unmatchable\n\n"
-                    "OUTPUT RULES:\n"
-                    "- If SKIP: reply with only the word SKIP\n"
-                    "- If ANSWER: reply with only the exact matching option text from the list\n"
-                    "- If UNCLEAR: reply with only the word UNCLEAR"
-                )
-            ),
-            HumanMessage(content=f"User said: {user_input}"),
+            _questionnaire_system(question_key, question_text),
+            dict(role="user", content=f"User said: {user_input}"),
         ]
-        response = self._llm.invoke(messages)
-        result = response.content.strip()
-        upper = result.upper()
-        if upper == "SKIP":
-            return "skip", None
-        if upper == "UNCLEAR":
-            return "unclear", None
-        for opt in options:
-            if opt.lower() in result.lower() or result.lower() in opt.lower():
-                return "answer", opt
-        return "unclear", None
+        result = _match_questionnaire_reply(self._classify(messages), question_key)
+        self._remember(key, result)
+        return result
 
     def retry_or_give_up(self, user_input: str) -> bool:
         """
         Return True if the user wants to retry a failed device reading,
         False if they want to stop and return to idle.
         """
-        messages = [
-            SystemMessage(
-                content=(
-                    "The user was asked whether they want to retry a failed device reading "
-                    "or give up and finish the session.\n"
-                    "Reply with ONLY 'RETRY' if they want to try again, "
-                    "or 'GIVEUP' if they want to stop."
-                )
-            ),
-            HumanMessage(content=f"User said: {user_input}"),
-        ]
-        response = self._llm.invoke(messages)
-        return "RETRY" in response.content.upper()
+        said = _normalize(user_input)
+        if said in _RETRY_WORDS:
+            return True
+        if said in _GIVE_UP_WORDS:
+            return False
+        key = ("retry", said)
+        cached = self._cached(key)
+        if cached is not _MISS:
+            return cached
+        messages = [_RETRY_SYSTEM, dict(role="user", content=f"User said: {user_input}")]
+        # Yes/no: the answer is a single token, so stop decoding there.
+        retry = self._classify(messages, max_tokens=1).upper().startswith("Y")
+        self._remember(key, retry)
+        return retry
@@ -1,23 +1,73 @@
 import argparse
 import os
+import selectors
+import sys
 import threading
 import time
 
 import tts
 from robot import HealthRobotGraph
-from ws_server import action_queue, start_ws_server, DEFAULT_PORT
+from ws_server import action_queue, request_reset, start_ws_server, DEFAULT_PORT
 
+# Set by the terminal's quit/exit command; HealthRobotGraph.run() returns.
+shutdown_event = threading.Event()
 
-def _terminal_input_loop():
-    """Forward terminal keystrokes into the same action queue as WebSocket actions."""
-    while True:
+
+def _input_lines():
+    """Yield lines from input() until EOF or shutdown."""
+    while not shutdown_event.is_set():
         try:
-            line = input("You: ").strip()
+            yield input("You: ")
         except EOFError:
-            break
+            return
+
+
+def _read_lines():
+    """Yield terminal lines until EOF or shutdown.
+
+    Waits on stdin with a selector so the loop also notices shutdown_event.
+    Falls back to input() where stdin can't be selected: on Windows, where
+    select() only works on sockets, and when stdin is a regular file.
+    """
+    if sys.platform == "win32":
+        yield from _input_lines()
+        return
+
+    fd = sys.stdin.fileno()
+    with selectors.DefaultSelector() as sel:
+        try:
+            sel.register(fd, selectors.EVENT_READ)
+        except OSError:
+            yield from _input_lines()
+            return
+
+        # Read the descriptor directly: a buffered readline() could leave
+        # further pasted lines in Python's buffer, where select() can't see them.
+        pending = b""
+        print("You: ", end="", flush=True)
+        while not shutdown_event.is_set():
+            if not sel.select(timeout=0.5):
+                continue
+            data = os.read(fd, 4096)
+            if not data:
+                if pending:
+                    yield pending.decode(errors="replace")
+                return
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                yield line.decode(errors="replace")
+            if lines:
+                print("You: ", end="", flush=True)
+
+
+def _terminal_input_loop():
+    """Forward terminal keystrokes into the same action queue as WebSocket actions."""
+    for line in _read_lines():
+        line = line.strip()
         if line.lower() in ("quit", "exit"):
             print("\nRobot: Goodbye! Come back anytime.")
-            os.kill(os.getpid(), 2)  # SIGINT → KeyboardInterrupt in main thread
+            shutdown_event.set()
+            request_reset()  # unwind whatever the robot is waiting on
             break
         if line:
             action_queue.put(line)
@@ -62,12 +112,18 @@ def main():
         print("Set it with: export OPENAI_API_KEY='your-key-here'")
         return
 
-    tts.init(args.tts)
     server = start_ws_server(args.port)
+    # Give any already-open app clients time to detect the new server and reconnect
+    # before the first TTS broadcast fires. The Android app retries every 2 s,
+    # so 3 s is enough for a full reconnect cycle. The rest of startup (voice
+    # model, STT connection, robot) happens inside that window.
+    clients_ready_at = time.monotonic() + 3
     print(f"WebSocket server listening on port {args.port}")
     print(f"  ws://0.0.0.0:{args.port}  – state push and action receive")
     print("Terminal input also accepted. Type 'quit' or 'exit' to stop.\n")
 
+    tts.init(args.tts)
+
     if not args.no_listen:
         import stt
 
@@ -77,19 +133,22 @@ def main():
     input_thread = threading.Thread(target=_terminal_input_loop, daemon=True)
     input_thread.start()
 
-    # Give any already-open app clients time to detect the new server and reconnect
-    # before the first TTS broadcast fires. The Android app retries every 2 s,
-    # so 3 s is enough for a full reconnect cycle.
-    time.sleep(3)
-
     sensor_mode = "dummy" if args.dummy else "real"
-    robot = HealthRobotGraph(sensor_mode=sensor_mode, use_printer=not args.no_printer)
+    robot = HealthRobotGraph(
+        sensor_mode=sensor_mode,
+        use_printer=not args.no_printer,
+        shutdown_event=shutdown_event,
+    )
+
+    time.sleep(max(0.0, clients_ready_at - time.monotonic()))
+
     try:
         robot.run()
     except (KeyboardInterrupt, SystemExit):
         pass
     finally:
         print("\nShutting down.")
+        shutdown_event.set()
         server.shutdown()
 
 
@@ -10,9 +10,10 @@ Usage:
     pu.print_footer()
 """
 
+import textwrap
 from datetime import datetime
 
-from escpos.printer import Usb
+from escpos.printer import Dummy, Usb
 
 VENDOR_ID = 0x04B8
 PRODUCT_ID = 0x0202
@@ -32,19 +33,12 @@ def _divider(char="-"):
     return char * W + "\n"
 
 
-def _wrap(text, width=W):
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        if current and len(current) + 1 + len(word) > width:
-            lines.append(current)
-            current = word
-        else:
-            current = (current + " " + word).strip()
-    if current:
-        lines.append(current)
-    return lines
+# Break only at spaces; an over-long word gets a line of its own.
+_WRAPPER = textwrap.TextWrapper(width=W, break_long_words=False, break_on_hyphens=False)
+
+
+def _wrap(text):
+    return _WRAPPER.wrap(text)
 
 
 class PrintUtility:
@@ -56,25 +50,61 @@ class PrintUtility:
             self._p._raw(b"\x1b\x40")  # ESC @ — reset printer to defaults
         except Exception as e:
             raise RuntimeError(f"Could not open printer — {e}") from e
+        # Each section is rendered into this buffer and sent to the printer
+        # as one USB write, rather than one write per text()/set() call.
+        self._buf = Dummy()
 
-    def print_header(self):
-        p = self._p
-        now = datetime.now()
+        # The parts of the receipt that never change, rendered once.
+        p = self._buf
         p.set(align="center", bold=True)
         p.text("HeartPod\n")
         p.set(align="center", bold=False)
-        p.text(now.strftime("%-d %B %Y") + "\n")
-        p.text(now.strftime("%H:%M:%S") + "\n")
+        self._header_start = self._take()
         p.set(align="left")
         p.text("\n")
         p.text(_divider("-"))
+        self._header_end = self._take()
+        self._footer = self._render_footer(self.disclaimer)
+
+    def _take(self):
+        """Return everything rendered into the buffer so far, and empty it."""
+        out = self._buf.output
+        self._buf.clear()
+        return out
+
+    def _flush(self):
+        self._p._raw(self._take())
+
+    def _render_footer(self, disclaimer):
+        p = self._buf
+        p.set(align="left")
+        p.text(_divider("-"))
+        p.set(align="center", bold=True)
+        p.text("\n")
+        p.text("Disclaimer\n")
+        p.set(bold=False)
+        for line in _wrap(disclaimer):
+            p.text(line + "\n")
+        p.text("\n")
+        p.set(align="left")
+        p.text(_divider("-"))
+        p.set(align="center")
+        p.text("\n")
+        p.text("Thank you for using HeartPod.\n")
+        p.text("\n")
+        p.cut()
+        return self._take()
+
+    def print_header(self):
+        self._buf.text(datetime.now().strftime("%-d %B %Y\n%H:%M:%S\n"))
+        self._p._raw(self._header_start + self._take() + self._header_end)
 
     def print_results(self, results):
-        p = self._p
+        p = self._buf
 
         def row(label, value):
-            gap = W - len(label) - len(value)
-            p.text(label + " " * max(gap, 1) + value + "\n")
+            # Right-align the value to the receipt edge, at least one space out
+            p.text(f"{label}{value:>{max(W - len(label), len(value) + 1)}}\n")
 
         p.text("\n")
 
@@ -90,27 +120,13 @@ class PrintUtility:
         row("Blood Pressure", f"{results['systolic']}/{results['diastolic']} mmHg")
 
         p.text("\n")
+        self._flush()
 
     def print_footer(self, disclaimer=None):
-        if disclaimer is None:
-            disclaimer = self.disclaimer
-        p = self._p
-        p.set(align="left")
-        p.text(_divider("-"))
-        p.set(align="center", bold=True)
-        p.text("\n")
-        p.text("Disclaimer\n")
-        p.set(bold=False)
-        for line in _wrap(disclaimer):
-            p.text(line + "\n")
-        p.text("\n")
-        p.set(align="left")
-        p.text(_divider("-"))
-        p.set(align="center")
-        p.text("\n")
-        p.text("Thank you for using HeartPod.\n")
-        p.text("\n")
-        p.cut()
+        if disclaimer is None or disclaimer == self.disclaimer:
+            self._p._raw(self._footer)
+        else:
+            self._p._raw(self._render_footer(disclaimer))
 
 
 if __name__ == "__main__":
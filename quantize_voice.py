@@ -0,0 +1,35 @@
+"""
+Quantize the Piper alba voice model to int8 for faster CPU synthesis.
+
+Run after download_voice.py. Writes:
+  voices/en_GB-alba-medium.int8.onnx  (dynamic int8 weights)
+
+tts.py loads the int8 model instead of the float32 one whenever this file
+exists; delete it to go back. Listen to a few prompts before keeping it —
+quantization trades a little audio quality for speed.
+
+Requires onnxruntime (installed with piper-tts) and the onnx package, which
+piper-tts does not install:  pip install onnx
+"""
+
+import os
+
+try:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError as e:  # onnxruntime.quantization imports onnx
+    raise SystemExit(f"{e}\nQuantizing needs onnxruntime (installed with piper-tts) and onnx: pip install onnx")
+
+VOICES_DIR = os.path.join(os.path.dirname(__file__), "voices")
+SOURCE = os.path.join(VOICES_DIR, "en_GB-alba-medium.onnx")
+TARGET = os.path.join(VOICES_DIR, "en_GB-alba-medium.int8.onnx")
+
+
+if __name__ == "__main__":
+    if not os.path.isfile(SOURCE):
+        raise SystemExit(f"Voice model not found: {SOURCE}\nRun `python download_voice.py` first.")
+    print(f"Quantizing {os.path.basename(SOURCE)} ...")
+    part = TARGET + ".part"
+    quantize_dynamic(SOURCE, part, weight_type=QuantType.QInt8)
+    os.replace(part, TARGET)
+    print(f"  done: {os.path.basename(TARGET)} ({os.path.getsize(TARGET) / 1_048_576:.1f} MB)")
+    print("tts.py will use it automatically. Delete it to go back to the float32 model.")
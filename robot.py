@@ -7,13 +7,15 @@ The run() method drives the conversation; all routing logic lives here.
 
 import json
 import queue as queue_module
+import re
+import sys
 import threading
 
 from langgraph.graph import StateGraph, END
 
 import time
 
-from config import PAGE_CONFIG, MAX_RETRIES, READING_TIMEOUT, RECAP_RETURN_DELAY
+from config import STAGES, StageConfig, MAX_RETRIES, READING_TIMEOUT, RECAP_RETURN_DELAY
 from state import ConversationState
 from device import device_queue, simulate_reading, get_real_reading
 from llm_helpers import LLMHelper
@@ -28,15 +30,218 @@ from ws_server import (
 )
 
 
+# ---------------------------------------------------------------------------
+# Pre-built WebSocket payload pieces. The stage config is static, so the constant
+# part of every stage's data payload is assembled once here; _build_data()
+# only adds the fields that depend on the session.
+# ---------------------------------------------------------------------------
+
+_INTRO_DEVICE = {
+    "oximeter_intro": "oximeter",
+    "bp_intro": "blood pressure monitor",
+    "scale_intro": "scale",
+    "height_intro": "height sensor",
+}
+
+# Stages whose payload is just the spoken message
+_MESSAGE_STAGES = frozenset(
+    (
+        "welcome",
+        "measure_intro",
+        "oximeter_reading",
+        "bp_reading",
+        "scale_reading",
+        "height_reading",
+        "sorry",
+    )
+)
+
+
+def _stage_static(stage: str, cfg: StageConfig) -> dict:
+    if cfg.options is not None:
+        data = {
+            "question": cfg.message.split("\n")[0],
+            "options": json.dumps(cfg.options, separators=(",", ":")),
+        }
+    elif stage in _INTRO_DEVICE:
+        data = {"device": _INTRO_DEVICE[stage], "video_id": cfg.video_id}
+    else:
+        data = {}
+    # Optional Temi navigation target — set "location" in PAGE_CONFIG to use.
+    if cfg.location:
+        data["location"] = cfg.location
+    return data
+
+
+_STAGE_STATIC = {stage: _stage_static(stage, cfg) for stage, cfg in STAGES.items()}
+
+
+# A blood pressure reading as stored by the bp sensor: "systolic/diastolic"
+_BP_RE = re.compile(r"\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def _done_template(reading: str, stage: str) -> str:
+    """A done page's message as one str.format template: the reading sentence
+    (with placeholders) followed by the stage's static message."""
+    return reading + STAGES[stage].message.replace("{", "{{").replace("}", "}}")
+
+
+_OXIMETER_DONE = _done_template(
+    "Your heart rate is {hr} beats per minute, "
+    "and your blood oxygen level is {spo2} percent. ",
+    "oximeter_done",
+)
+_BP_DONE = _done_template("Your blood pressure is {0} over {1}. ", "bp_done")
+_BP_DONE_RAW = _done_template("Your blood pressure is {0}. ", "bp_done")
+_SCALE_DONE = _done_template("Your weight is {0} kilograms. ", "scale_done")
+_HEIGHT_DONE = _done_template("Your height is {0} metres. ", "height_done")
+
+# Session-dependent payload fields, by stage: builder(readings, answers) → dict
+_DATA_BUILDERS = {
+    "oximeter_done": lambda r, a: {
+        "value": f"HR: {r.get('oximeter_hr', '?')} bpm  /  SpO2: {r.get('oximeter_spo2', '?')}%",
+        "unit": "",
+    },
+    "bp_done": lambda r, a: {"value": r.get("bp", "?"), "unit": "mmHg"},
+    "scale_done": lambda r, a: {"value": str(r.get("scale", "?")), "unit": "kg"},
+    "height_done": lambda r, a: {"value": str(r.get("height", "?")), "unit": "m"},
+    "recap": lambda r, a: {
+        "q1": a.get("q1", "not answered"),
+        "q2": a.get("q2", "not answered"),
+        "q3": a.get("q3", "not answered"),
+        "oximeter": f"{r.get('oximeter_hr', '?')} bpm / {r.get('oximeter_spo2', '?')}%",
+        "bp": f"{r.get('bp', '?')} mmHg",
+        "weight": f"{r.get('scale', '?')} kg",
+        "height": f"{r.get('height', '?')} m",
+    },
+}
+
+
+# Stage → the stage that normally follows it, where that stage's speech is
+# static text. Its audio is synthesised while the current page is showing.
+_PREFETCH_NEXT = {
+    "idle": "welcome",
+    "welcome": "q1",
+    "q1": "q2",
+    "q2": "q3",
+    "q3": "measure_intro",
+    "oximeter_intro": "oximeter_reading",
+    "bp_intro": "bp_reading",
+    "scale_intro": "scale_reading",
+    "height_intro": "height_reading",
+    "height_done": "recap",
+}
+
+QUESTIONS = ("q1", "q2", "q3")
+
+# Spoken when a questionnaire answer can't be matched to an option
+_REPROMPT = {
+    qkey: "I didn't quite catch that. Please choose one of:\n    "
+    + "\n    ".join(STAGES[qkey].options)
+    for qkey in QUESTIONS
+}
+
+# Stages whose node only shows the stage's static text (see _simple_node)
+_SIMPLE_STAGES = (
+    "idle",
+    "welcome",
+    "q1",
+    "q2",
+    "q3",
+    "measure_intro",
+    "oximeter_intro",
+    "oximeter_reading",
+    "bp_intro",
+    "bp_reading",
+    "scale_intro",
+    "scale_reading",
+    "height_intro",
+    "height_reading",
+)
+
+# Graph nodes, in session order
+_GRAPH_NODES = (
+    "idle",
+    "welcome",
+    "q1",
+    "q2",
+    "q3",
+    "measure_intro",
+    "oximeter_intro",
+    "oximeter_reading",
+    "oximeter_done",
+    "bp_intro",
+    "bp_reading",
+    "bp_done",
+    "scale_intro",
+    "scale_reading",
+    "scale_done",
+    "height_intro",
+    "height_reading",
+    "height_done",
+    "recap",
+    "sorry",
+)
+
+# Each node's successor on the happy path; run() handles the branching
+_LINEAR_EDGES = tuple(zip(_GRAPH_NODES[:-2], _GRAPH_NODES[1:-1])) + (
+    ("recap", END),
+    ("sorry", END),
+)
+
+
+def _store_oximeter(readings: dict, value: dict) -> None:
+    readings["oximeter_hr"] = value["hr"]
+    readings["oximeter_spo2"] = value["spo2"]
+
+
+def _store_as(key: str):
+    """Return a store function that saves the reading's value under `key`."""
+
+    def store(readings: dict, value) -> None:
+        readings[key] = value
+
+    return store
+
+
+# Measurements in session order:
+# (device, intro stage, reading stage, done stage, store(readings, value))
+DEVICE_STAGES = (
+    ("oximeter", "oximeter_intro", "oximeter_reading", "oximeter_done", _store_oximeter),
+    ("bp", "bp_intro", "bp_reading", "bp_done", _store_as("bp")),
+    ("scale", "scale_intro", "scale_reading", "scale_done", _store_as("scale")),
+    ("height", "height_intro", "height_reading", "height_done", _store_as("height")),
+)
+
+
 class _ResetRequested(Exception):
     """Raised when the user taps the Reset button; unwinds to the run() loop."""
 
 
 class HealthRobotGraph:
 
-    def __init__(self, sensor_mode: str = "real", use_printer: bool = True):
+    def __init__(
+        self,
+        sensor_mode: str = "real",
+        use_printer: bool = True,
+        shutdown_event: threading.Event = None,
+    ):
         self.sensor_mode = sensor_mode
+        # Set (together with reset_event, to unwind any wait) to make run() return
+        self._shutdown = shutdown_event or threading.Event()
+        self._prefetch_text = ""  # next page's speech, synthesised after the current
+        tts.keep_on_disk(cfg.speech for cfg in STAGES.values())
         self.llm = LLMHelper()
+        # stage → node function, built once
+        self._nodes = {stage: self._simple_node(stage) for stage in _SIMPLE_STAGES}
+        self._nodes.update(
+            oximeter_done=self.oximeter_done_node,
+            bp_done=self.bp_done_node,
+            scale_done=self.scale_done_node,
+            height_done=self.height_done_node,
+            recap=self.recap_node,
+            sorry=self.sorry_node,
+        )
         self.graph = self._build_graph()
         self.printer = None
         if use_printer:
@@ -52,163 +257,74 @@ class HealthRobotGraph:
     # Node functions
     # Each node sets current_stage, page_id, and robot_response on state.
     # Nodes whose message depends on runtime data build the message inline;
-    # all others pull directly from PAGE_CONFIG.
+    # all others pull directly from STAGES.
     # ------------------------------------------------------------------
 
     def _set_page(
         self, state: ConversationState, stage: str, message: str
     ) -> ConversationState:
+        cfg = STAGES[stage]
         state["current_stage"] = stage
-        state["page_id"] = PAGE_CONFIG[stage]["page_id"]
+        state["page_id"] = cfg.page_id
         state["robot_response"] = message
-        update_state(int(state["page_id"]), self._build_data(state))
+        update_state(cfg.page_id_int, self._build_data(state))
         flush_action_queue()
+        nxt = _PREFETCH_NEXT.get(stage)
+        self._prefetch_text = STAGES[nxt].speech if nxt else ""
         return state
 
     def _build_data(self, state: ConversationState) -> dict:
         """Build the data payload for the current stage to send via WebSocket state message."""
         stage = state["current_stage"]
-        r = state.get("readings", {})
-
-        if stage == "idle":
-            data = {}
-        elif stage == "welcome":
-            data = {"message": state["robot_response"]}
-        elif stage in ("q1", "q2", "q3"):
-            cfg = PAGE_CONFIG[stage]
-            question = cfg["message"].split("\n")[0]
-            data = {"question": question, "options": json.dumps(cfg["options"])}
-        elif stage == "measure_intro":
-            data = {"message": state["robot_response"]}
-        elif stage == "oximeter_intro":
-            data = {
-                "device": "oximeter",
-                "video_id": PAGE_CONFIG["oximeter_intro"]["video_id"],
-            }
-        elif stage == "oximeter_reading":
-            data = {"message": state["robot_response"]}
-        elif stage == "oximeter_done":
-            data = {
-                "value": f"HR: {r.get('oximeter_hr', '?')} bpm  /  SpO2: {r.get('oximeter_spo2', '?')}%",
-                "unit": "",
-            }
-        elif stage == "bp_intro":
-            data = {
-                "device": "blood pressure monitor",
-                "video_id": PAGE_CONFIG["bp_intro"]["video_id"],
-            }
-        elif stage == "bp_reading":
-            data = {"message": state["robot_response"]}
-        elif stage == "bp_done":
-            data = {"value": r.get("bp", "?"), "unit": "mmHg"}
-        elif stage == "scale_intro":
-            data = {
-                "device": "scale",
-                "video_id": PAGE_CONFIG["scale_intro"]["video_id"],
-            }
-        elif stage == "scale_reading":
-            data = {"message": state["robot_response"]}
-        elif stage == "scale_done":
-            data = {"value": str(r.get("scale", "?")), "unit": "kg"}
-        elif stage == "height_intro":
-            data = {
-                "device": "height sensor",
-                "video_id": PAGE_CONFIG["height_intro"]["video_id"],
-            }
-        elif stage == "height_reading":
-            data = {"message": state["robot_response"]}
-        elif stage == "height_done":
-            data = {"value": str(r.get("height", "?")), "unit": "m"}
-        elif stage == "recap":
-            a = state["answers"]
-            data = {
-                "q1": a.get("q1", "not answered"),
-                "q2": a.get("q2", "not answered"),
-                "q3": a.get("q3", "not answered"),
-                "oximeter": f"{r.get('oximeter_hr', '?')} bpm / {r.get('oximeter_spo2', '?')}%",
-                "bp": f"{r.get('bp', '?')} mmHg",
-                "weight": f"{r.get('scale', '?')} kg",
-                "height": f"{r.get('height', '?')} m",
-            }
-        elif stage == "sorry":
-            data = {"message": state["robot_response"]}
-        else:
-            data = {}
-
-        # Attach optional Temi navigation target — set "location" in PAGE_CONFIG to use.
-        location = PAGE_CONFIG.get(stage, {}).get("location", "")
-        if location:
-            data["location"] = location
-
+        data = dict(_STAGE_STATIC.get(stage, ()))
+        if stage in _MESSAGE_STAGES:
+            data["message"] = state["robot_response"]
+            return data
+
+        builder = _DATA_BUILDERS.get(stage)
+        if builder is not None:
+            data.update(builder(state.get("readings", {}), state.get("answers", {})))
         return data
 
     def _simple_node(self, stage: str):
-        """Factory: returns a node function that just displays PAGE_CONFIG text."""
+        """Factory: returns a node function that just displays the stage's text."""
+        speech = STAGES[stage].speech
 
         def node(state: ConversationState) -> ConversationState:
-            cfg = PAGE_CONFIG[stage]
-            return self._set_page(state, stage, cfg.get("speech", cfg["message"]))
+            return self._set_page(state, stage, speech)
 
         node.__name__ = f"{stage}_node"
         return node
 
-    # Simple nodes wired up via the factory
-    idle_node = property(lambda self: self._simple_node("idle"))
-    welcome_node = property(lambda self: self._simple_node("welcome"))
-    q1_node = property(lambda self: self._simple_node("q1"))
-    q2_node = property(lambda self: self._simple_node("q2"))
-    q3_node = property(lambda self: self._simple_node("q3"))
-    measure_intro_node = property(lambda self: self._simple_node("measure_intro"))
-    oximeter_intro_node = property(lambda self: self._simple_node("oximeter_intro"))
-    oximeter_reading_node = property(lambda self: self._simple_node("oximeter_reading"))
-    bp_intro_node = property(lambda self: self._simple_node("bp_intro"))
-    bp_reading_node = property(lambda self: self._simple_node("bp_reading"))
-    scale_intro_node = property(lambda self: self._simple_node("scale_intro"))
-    scale_reading_node = property(lambda self: self._simple_node("scale_reading"))
-    height_intro_node = property(lambda self: self._simple_node("height_intro"))
-    height_reading_node = property(lambda self: self._simple_node("height_reading"))
-
     # Nodes that embed live readings in their message
     def oximeter_done_node(self, state: ConversationState) -> ConversationState:
         r = state["readings"]
-        reading = (
-            f"Your heart rate is {r.get('oximeter_hr', '?')} beats per minute, "
-            f"and your blood oxygen level is {r.get('oximeter_spo2', '?')} percent. "
+        msg = _OXIMETER_DONE.format(
+            hr=r.get("oximeter_hr", "?"), spo2=r.get("oximeter_spo2", "?")
         )
-        msg = reading + PAGE_CONFIG["oximeter_done"]["message"]
         return self._set_page(state, "oximeter_done", msg)
 
     def bp_done_node(self, state: ConversationState) -> ConversationState:
         r = state["readings"]
         bp = r.get("bp", "?/?")
-        try:
-            systolic, diastolic = str(bp).split("/")
-            reading = (
-                f"Your blood pressure is {systolic.strip()} over {diastolic.strip()}. "
-            )
-        except ValueError:
-            reading = f"Your blood pressure is {bp}. "
-        msg = reading + PAGE_CONFIG["bp_done"]["message"]
+        m = _BP_RE.match(str(bp))
+        msg = _BP_DONE.format(m[1], m[2]) if m else _BP_DONE_RAW.format(bp)
         return self._set_page(state, "bp_done", msg)
 
     def scale_done_node(self, state: ConversationState) -> ConversationState:
-        r = state["readings"]
-        reading = f"Your weight is {r.get('scale', '?')} kilograms. "
-        msg = reading + PAGE_CONFIG["scale_done"]["message"]
+        msg = _SCALE_DONE.format(state["readings"].get("scale", "?"))
         return self._set_page(state, "scale_done", msg)
 
     def height_done_node(self, state: ConversationState) -> ConversationState:
-        r = state["readings"]
-        reading = f"Your height is {r.get('height', '?')} metres. "
-        msg = reading + PAGE_CONFIG["height_done"]["message"]
+        msg = _HEIGHT_DONE.format(state["readings"].get("height", "?"))
         return self._set_page(state, "height_done", msg)
 
     def recap_node(self, state: ConversationState) -> ConversationState:
-        return self._set_page(state, "recap", PAGE_CONFIG["recap"]["message"])
+        return self._set_page(state, "recap", STAGES["recap"].message)
 
     def sorry_node(self, state: ConversationState) -> ConversationState:
         """Triggered only by a device reading failure (timeout)."""
-        return self._set_page(state, "sorry", PAGE_CONFIG["sorry"]["message"])
+        return self._set_page(state, "sorry", STAGES["sorry"].message)
 
     # ------------------------------------------------------------------
     # LangGraph wiring
@@ -217,57 +333,13 @@ class HealthRobotGraph:
     def _build_graph(self) -> StateGraph:
         workflow = StateGraph(ConversationState)
 
-        # Register all nodes
-        for stage in (
-            "idle",
-            "welcome",
-            "q1",
-            "q2",
-            "q3",
-            "measure_intro",
-            "oximeter_intro",
-            "oximeter_reading",
-            "oximeter_done",
-            "bp_intro",
-            "bp_reading",
-            "bp_done",
-            "scale_intro",
-            "scale_reading",
-            "scale_done",
-            "height_intro",
-            "height_reading",
-            "height_done",
-            "recap",
-            "sorry",
-        ):
-            node_fn = getattr(self, f"{stage}_node", None) or self._simple_node(stage)
-            workflow.add_node(stage, node_fn)
+        for stage in _GRAPH_NODES:
+            workflow.add_node(stage, self._nodes[stage])
 
         workflow.set_entry_point("idle")
 
         # Linear edges (branching is handled in run())
-        for src, dst in [
-            ("idle", "welcome"),
-            ("welcome", "q1"),
-            ("q1", "q2"),
-            ("q2", "q3"),
-            ("q3", "measure_intro"),
-            ("measure_intro", "oximeter_intro"),
-            ("oximeter_intro", "oximeter_reading"),
-            ("oximeter_reading", "oximeter_done"),
-            ("oximeter_done", "bp_intro"),
-            ("bp_intro", "bp_reading"),
-            ("bp_reading", "bp_done"),
-            ("bp_done", "scale_intro"),
-            ("scale_intro", "scale_reading"),
-            ("scale_reading", "scale_done"),
-            ("scale_done", "height_intro"),
-            ("height_intro", "height_reading"),
-            ("height_reading", "height_done"),
-            ("height_done", "recap"),
-            ("recap", END),
-            ("sorry", END),
-        ]:
+        for src, dst in _LINEAR_EDGES:
             workflow.add_edge(src, dst)
 
         return workflow.compile()
@@ -278,8 +350,12 @@ class HealthRobotGraph:
 
     def _print_robot(self, msg: str, page_id: str = None):
         prefix = f"[Page {page_id}] " if page_id else ""
-        print(f"\n{prefix}Robot: {msg}\n")
+        # one write: print() would also write the trailing "\n" separately
+        sys.stdout.write(f"\n{prefix}Robot: {msg}\n\n")
         tts.speak(msg)
+        if self._prefetch_text:
+            tts.prefetch(self._prefetch_text)
+            self._prefetch_text = ""
 
     def _ask_user(self) -> str:
         """Block until the Android app (or terminal) posts an action.
@@ -288,7 +364,8 @@ class HealthRobotGraph:
             if reset_event.is_set():
                 raise _ResetRequested()
             try:
-                result = action_queue.get(timeout=0.2)
+                # No timeout: request_reset() wakes this with queue.Empty
+                result = action_queue.get()
             except queue_module.Empty:
                 continue
             tts.stop()  # cut speech the moment the user acts
@@ -335,19 +412,6 @@ class HealthRobotGraph:
                 return True
             self._print_robot(message)
 
-    def _store_reading_data(
-        self, device: str, data: dict, state: ConversationState
-    ) -> None:
-        if device == "oximeter":
-            state["readings"]["oximeter_hr"] = data["value"]["hr"]
-            state["readings"]["oximeter_spo2"] = data["value"]["spo2"]
-        elif device == "bp":
-            state["readings"]["bp"] = data["value"]
-        elif device == "scale":
-            state["readings"]["scale"] = data["value"]
-        elif device == "height":
-            state["readings"]["height"] = data["value"]
-
     def _start_reading_thread(self, device: str):
         done_event = threading.Event()
         result_box = [None]
@@ -377,10 +441,20 @@ class HealthRobotGraph:
                 result_box[0] = None
             finally:
                 done_event.set()
+                action_queue.wake()
 
         threading.Thread(target=_run, daemon=True, name=f"sensor-{device}").start()
         return done_event, result_box
 
+    def _wait_for_reading(self, done_event: threading.Event) -> None:
+        """Block until the sensor thread finishes.
+        Raises _ResetRequested within half a second of a reset (or quit)."""
+        while True:
+            if reset_event.is_set():
+                raise _ResetRequested()
+            if done_event.wait(0.5):
+                return
+
     def _wait_for_proceed_or_reading(
         self,
         action_context: str,
@@ -396,13 +470,15 @@ class HealthRobotGraph:
             if done_event.is_set() and result_box[0] is None:
                 return "reading_failed"
             try:
-                user_input = action_queue.get(timeout=0.2)
+                # Woken with queue.Empty by a reset or by the sensor thread
+                # finishing (see _start_reading_thread)
+                user_input = action_queue.get()
             except queue_module.Empty:
                 continue
             tts.stop()
             if reset_event.is_set():
                 raise _ResetRequested()
-            # Re-check: data may have arrived during the 0.2s wait
+            # Re-check: data may have arrived while waiting
             if done_event.is_set() and result_box[0] is not None:
                 return "reading_done"
             should_go, message = self.llm.evaluate_proceed(
@@ -412,10 +488,34 @@ class HealthRobotGraph:
                 return "proceed"
             self._print_robot(message)
 
-    def _reading_loop(self, device, intro_stage, done_stage, state):
-        intro_node = getattr(self, f"{intro_stage}_node")
-        reading_node = getattr(self, f"{device}_reading_node")
-        done_node = getattr(self, f"{done_stage}_node")
+    def _offer_retry(self, device: str, state: ConversationState) -> bool:
+        """
+        Show the sorry page after a failed reading and ask whether to retry.
+        Returns True if the user wants another attempt, False if the
+        measurement should be skipped (user declined or MAX_RETRIES reached).
+        """
+        state["retry_count"] += 1
+        state["retry_stage"] = f"{device}_reading"
+        state = self.sorry_node(state)
+        if state["retry_count"] >= MAX_RETRIES:
+            self._print_robot(
+                state["robot_response"]
+                + " Maximum retries reached. We will skip this measurement and move on.",
+                state["page_id"],
+            )
+            return False
+        self._print_robot(state["robot_response"], state["page_id"])
+        user_input = self._ask_user()
+        if not self.llm.retry_or_give_up(user_input):
+            self._print_robot("No problem. We will skip this measurement and move on.")
+            return False
+        return True
+
+    def _reading_loop(self, device, intro_stage, reading_stage, done_stage, store, state):
+        intro_node = self._nodes[intro_stage]
+        reading_node = self._nodes[reading_stage]
+        done_node = self._nodes[done_stage]
+        readings = state["readings"]
 
         # ── Intro phase: show screen and immediately start background read ────
         state = intro_node(state)
@@ -425,7 +525,7 @@ class HealthRobotGraph:
 
         while True:
             outcome = self._wait_for_proceed_or_reading(
-                PAGE_CONFIG[intro_stage]["action_context"],
+                STAGES[intro_stage].action_context,
                 state["robot_response"],
                 done_event,
                 result_box,
@@ -439,7 +539,7 @@ class HealthRobotGraph:
 
         if outcome == "reading_done" and result_box[0] is not None:
             # Early success — skip reading screen, go straight to done
-            self._store_reading_data(device, result_box[0], state)
+            store(readings, result_box[0]["value"])
         else:
             # User pressed ready, OR background thread failed during intro.
             # If thread failed already, start a fresh one.
@@ -450,29 +550,14 @@ class HealthRobotGraph:
             while True:
                 state = reading_node(state)
                 self._print_robot(state["robot_response"], state["page_id"])
-                done_event.wait()  # returns immediately if already set
+                self._wait_for_reading(done_event)  # returns at once if already set
                 data = result_box[0]
                 if data is not None:
-                    self._store_reading_data(device, data, state)
+                    store(readings, data["value"])
                     break  # → done phase
 
                 # Sensor timeout
-                state["retry_count"] += 1
-                state["retry_stage"] = f"{device}_reading"
-                state = self.sorry_node(state)
-                if state["retry_count"] >= MAX_RETRIES:
-                    self._print_robot(
-                        state["robot_response"]
-                        + " Maximum retries reached. We will skip this measurement and move on.",
-                        state["page_id"],
-                    )
-                    return False
-                self._print_robot(state["robot_response"], state["page_id"])
-                user_input = self._ask_user()
-                if not self.llm.retry_or_give_up(user_input):
-                    self._print_robot(
-                        "No problem. We will skip this measurement and move on."
-                    )
+                if not self._offer_retry(device, state):
                     return False
                 done_event, result_box = self._start_reading_thread(device)
 
@@ -481,42 +566,27 @@ class HealthRobotGraph:
             state = done_node(state)
             self._print_robot(state["robot_response"], state["page_id"])
             if self._confirm_reading(
-                PAGE_CONFIG[done_stage]["action_context"], state["robot_response"]
+                STAGES[done_stage].action_context, state["robot_response"]
             ):
                 return True
             # User wants to redo — go back to reading screen with a fresh thread
             state = reading_node(state)
             self._print_robot(state["robot_response"], state["page_id"])
             done_event, result_box = self._start_reading_thread(device)
-            done_event.wait()
+            self._wait_for_reading(done_event)
             data = result_box[0]
             if data is not None:
-                self._store_reading_data(device, data, state)
+                store(readings, data["value"])
                 continue  # back to done screen
 
             # Retry also failed
-            state["retry_count"] += 1
-            state["retry_stage"] = f"{device}_reading"
-            state = self.sorry_node(state)
-            if state["retry_count"] >= MAX_RETRIES:
-                self._print_robot(
-                    state["robot_response"]
-                    + " Maximum retries reached. We will skip this measurement and move on.",
-                    state["page_id"],
-                )
-                return False
-            self._print_robot(state["robot_response"], state["page_id"])
-            user_input = self._ask_user()
-            if not self.llm.retry_or_give_up(user_input):
-                self._print_robot(
-                    "No problem. We will skip this measurement and move on."
-                )
+            if not self._offer_retry(device, state):
                 return False
             done_event, result_box = self._start_reading_thread(device)
-            done_event.wait()
+            self._wait_for_reading(done_event)
             data = result_box[0]
             if data is not None:
-                self._store_reading_data(device, data, state)
+                store(readings, data["value"])
                 continue
             self._print_robot("No problem. We will skip this measurement and move on.")
             return False
@@ -526,12 +596,8 @@ class HealthRobotGraph:
         if self.printer is None:
             return
         r = state["readings"]
-        bp = r.get("bp", "?/?")
-        try:
-            systolic, diastolic = str(bp).split("/")
-            systolic, diastolic = int(systolic.strip()), int(diastolic.strip())
-        except (ValueError, AttributeError):
-            systolic, diastolic = "?", "?"
+        m = _BP_RE.match(str(r.get("bp", "")))
+        systolic, diastolic = (int(m[1]), int(m[2])) if m else ("?", "?")
         results = {
             "spo2": r.get("oximeter_spo2", "?"),
             "heart_rate": r.get("oximeter_hr", "?"),
@@ -557,14 +623,15 @@ class HealthRobotGraph:
         print("=" * 60)
         print("(Type 'quit' or 'exit' to end)\n")
 
-        while True:  # outer loop: returns here after recap, giving up, or reset
+        # outer loop: returns here after recap, giving up, or reset
+        while not self._shutdown.is_set():
             reset_event.clear()
             flush_action_queue()
             stt.release_hold()  # clear any stale hold from a reset during a video page
             try:
                 state: ConversationState = {
                     "current_stage": "idle",
-                    "page_id": PAGE_CONFIG["idle"]["page_id"],
+                    "page_id": STAGES["idle"].page_id,
                     "robot_response": "",
                     "answers": {},
                     "readings": {},
@@ -580,7 +647,7 @@ class HealthRobotGraph:
                 # triggers navigateTo on the frontend) to avoid a race
                 # where go_to_complete arrives before the clear().
                 navigation_complete_event.clear()
-                state = self.idle_node(state)
+                state = self._nodes["idle"](state)
                 # In temi mode, wait for Temi to arrive before speaking
                 # so the greeting plays on arrival, not in transit.
                 if tts.mode() == "temi":
@@ -591,28 +658,28 @@ class HealthRobotGraph:
                 flush_action_queue()
                 self._print_robot(state["robot_response"], state["page_id"])
                 self._wait_for_proceed(
-                    PAGE_CONFIG["idle"]["action_context"], state["robot_response"]
+                    STAGES["idle"].action_context, state["robot_response"]
                 )
 
                 # ── welcome ───────────────────────────────────────────────
                 stt.release_hold()
-                state = self.welcome_node(state)
+                state = self._nodes["welcome"](state)
                 self._print_robot(state["robot_response"], state["page_id"])
                 if not self._wait_for_consent(
-                    PAGE_CONFIG["welcome"]["action_context"], state["robot_response"]
+                    STAGES["welcome"].action_context, state["robot_response"]
                 ):
                     self._print_robot("No problem. Feel free to come back any time.")
                     continue
 
                 # ── questionnaire ─────────────────────────────────────────
-                for qkey in ("q1", "q2", "q3"):
-                    q_node = getattr(self, f"{qkey}_node")
-                    state = q_node(state)
+                for qkey in QUESTIONS:
+                    cfg = STAGES[qkey]
+                    state = self._nodes[qkey](state)
                     self._print_robot(state["robot_response"], state["page_id"])
                     while True:
                         user_input = self._ask_user()
                         intent, value = self.llm.evaluate_questionnaire_input(
-                            user_input, qkey, PAGE_CONFIG[qkey]["message"]
+                            user_input, qkey, cfg.message
                         )
                         if intent == "skip":
                             state["answers"][qkey] = "skipped"
@@ -621,41 +688,32 @@ class HealthRobotGraph:
                         if intent == "answer":
                             state["answers"][qkey] = value
                             print(f"  [Recorded {qkey}: {value}]")
-                            cfg = PAGE_CONFIG[qkey]
                             update_state(
-                                int(state["page_id"]),
-                                {
-                                    "question": cfg["message"].split("\n")[0],
-                                    "options": json.dumps(cfg["options"]),
-                                    "selected": value,
-                                },
+                                cfg.page_id_int,
+                                {**_STAGE_STATIC[qkey], "selected": value},
                             )
                             time.sleep(0.8)
                             break
-                        opts = "\n    ".join(PAGE_CONFIG[qkey]["options"])
-                        self._print_robot(
-                            f"I didn't quite catch that. Please choose one of:\n    {opts}"
-                        )
+                        self._print_robot(_REPROMPT[qkey])
 
                 # ── measure intro ─────────────────────────────────────────
-                state = self.measure_intro_node(state)
+                state = self._nodes["measure_intro"](state)
                 self._print_robot(state["robot_response"], state["page_id"])
                 self._wait_for_proceed(
-                    PAGE_CONFIG["measure_intro"]["action_context"],
+                    STAGES["measure_intro"].action_context,
                     state["robot_response"],
                 )
 
                 # ── device readings ───────────────────────────────────────
-                self._reading_loop("oximeter", "oximeter_intro", "oximeter_done", state)
-                self._reading_loop("bp", "bp_intro", "bp_done", state)
-                self._reading_loop("scale", "scale_intro", "scale_done", state)
-                self._reading_loop("height", "height_intro", "height_done", state)
+                for stages in DEVICE_STAGES:
+                    self._reading_loop(*stages, state)
 
                 # ── recap ─────────────────────────────────────────────────
                 state = self.recap_node(state)
                 self._print_robot(state["robot_response"], state["page_id"])
                 self._print_receipt(state)
-                time.sleep(RECAP_RETURN_DELAY)
+                reset_event.wait(RECAP_RETURN_DELAY)
 
             except _ResetRequested:
-                print("\n  [Reset requested — restarting]\n")
+                if not self._shutdown.is_set():
+                    print("\n  [Reset requested — restarting]\n")
@@ -14,12 +14,28 @@ OMRON_WRITE_CHAR_UUID    = "db5b55e0-aee7-11e1-965e-0002a5d5c51b"
 MAX_ATTEMPTS = 3
 
 
+# 10 ** exponent for every 4-bit signed exponent (-8..7), indexed by exponent + 8
+_POW10 = [10 ** e for e in range(-8, 8)]
+
+
 def _sfloat_to_float(sfloat_val):
-    exponent = sfloat_val >> 12
-    mantissa = sfloat_val & 0x0FFF
-    if exponent >= 8: exponent = -((0x000F + 1) - exponent)
-    if mantissa >= 2048: mantissa = -((0x0FFF + 1) - mantissa)
-    return mantissa * (10 ** exponent)
+    # IEEE-11073 16-bit SFLOAT: 4-bit signed exponent, 12-bit signed mantissa
+    exponent = (sfloat_val >> 12) - ((sfloat_val >> 11) & 0x10)
+    mantissa = (sfloat_val & 0x0FFF) - ((sfloat_val & 0x0800) << 1)
+    return mantissa * _POW10[exponent + 8]
+
+
+# Current Time characteristic: year, month, day, h, m, s, weekday, fractions, reason
+_CURRENT_TIME = struct.Struct('<HBBBBBBBB')
+
+
+def _current_time_payload():
+    now = datetime.now()
+    return _CURRENT_TIME.pack(
+        now.year, now.month, now.day,
+        now.hour, now.minute, now.second,
+        now.weekday() + 1, 0, 0
+    )
 
 
 async def get_reading():
@@ -39,53 +55,44 @@ async def get_reading():
 
         print(f"Found {device.name}. Connecting...")
         try:
-            done = asyncio.Event()
             disconnected = asyncio.Event()
-            result = [None]
             connected = [False]
             loop = asyncio.get_running_loop()
+            fut = loop.create_future()
 
             def on_disconnect(_client):
-                if connected[0] and result[0] is None:
+                if connected[0] and not fut.done():
                     print("\nDisconnected. Press the Start button on the monitor and try again.")
                     loop.call_soon_threadsafe(disconnected.set)
-                    loop.call_soon_threadsafe(done.set)
+                    fut.set_result(None)
 
             async with BleakClient(device, timeout=20.0, disconnected_callback=on_disconnect) as client:
                 connected[0] = True
                 print("Connected. Sending handshake...")
 
                 def handler(_sender, data: bytearray):
-                    if result[0] is not None:
+                    if fut.done():
                         return
                     systolic  = round(_sfloat_to_float(int.from_bytes(data[1:3], "little")), 1)
                     diastolic = round(_sfloat_to_float(int.from_bytes(data[3:5], "little")), 1)
                     print(f"  Systolic={systolic}, Diastolic={diastolic} mmHg")
-                    result[0] = {"systolic": systolic, "diastolic": diastolic}
-                    done.set()
+                    fut.set_result({"systolic": systolic, "diastolic": diastolic})
 
                 await client.start_notify(BP_MEASUREMENT_CHAR_UUID, handler)
 
-                now = datetime.now()
-                time_payload = struct.pack(
-                    '<HBBBBBBBB',
-                    now.year, now.month, now.day,
-                    now.hour, now.minute, now.second,
-                    now.weekday() + 1, 0, 0
-                )
-                await client.write_gatt_char(CURRENT_TIME_CHAR_UUID, time_payload)
+                await client.write_gatt_char(CURRENT_TIME_CHAR_UUID, _current_time_payload())
                 await client.write_gatt_char(OMRON_WRITE_CHAR_UUID, b'\x01\x00', response=True)
 
                 print("Waiting for reading...")
                 try:
-                    await asyncio.wait_for(done.wait(), timeout=60)
+                    reading = await asyncio.wait_for(fut, timeout=60)
                 except asyncio.TimeoutError:
                     print("Timed out waiting for a reading.")
                     if not disconnected.is_set():
                         await client.stop_notify(BP_MEASUREMENT_CHAR_UUID)
                     continue
 
-                if result[0] is None:
+                if reading is None:
                     continue
 
                 await client.stop_notify(BP_MEASUREMENT_CHAR_UUID)
@@ -95,7 +102,7 @@ async def get_reading():
             continue
 
         print("Done.")
-        return result[0]
+        return reading
 
     print(f"\nFailed to get a reading after {MAX_ATTEMPTS} attempts.")
     return None
@@ -139,14 +146,7 @@ async def get_all_readings():
 
                 await client.start_notify(BP_MEASUREMENT_CHAR_UUID, handler)
 
-                now = datetime.now()
-                time_payload = struct.pack(
-                    '<HBBBBBBBB',
-                    now.year, now.month, now.day,
-                    now.hour, now.minute, now.second,
-                    now.weekday() + 1, 0, 0
-                )
-                await client.write_gatt_char(CURRENT_TIME_CHAR_UUID, time_payload)
+                await client.write_gatt_char(CURRENT_TIME_CHAR_UUID, _current_time_payload())
                 await client.write_gatt_char(OMRON_WRITE_CHAR_UUID, b'\x01\x00', response=True)
 
                 print("Waiting for readings (device will disconnect when done)...")
@@ -41,42 +41,40 @@ async def get_reading():
 
         print(f"Connecting to {device.address} ...")
         try:
-            done = asyncio.Event()
             disconnected = asyncio.Event()
-            result: list = [None]
             loop = asyncio.get_running_loop()
+            fut = loop.create_future()
 
             def on_disconnect(_client):
-                if result[0] is None:
+                if not fut.done():
                     print("\nDisconnected from height sensor.")
                     loop.call_soon_threadsafe(disconnected.set)
-                    loop.call_soon_threadsafe(done.set)
+                    fut.set_result(None)
 
             async with BleakClient(device, timeout=30.0, disconnected_callback=on_disconnect) as client:
                 print("Connected. Please stand still under the sensor.")
 
                 def handler(_sender, data: bytearray):
-                    if result[0] is not None:
+                    if fut.done():
                         return
                     try:
                         height_mm = int(data.decode("utf-8").strip())
                         height_m = round(height_mm / 1000.0, 2)
                         print(f"Height reading: {height_m} m ({height_mm} mm)")
-                        result[0] = height_m
-                        loop.call_soon_threadsafe(done.set)
+                        fut.set_result(height_m)
                     except (ValueError, UnicodeDecodeError):
                         pass
 
                 await client.start_notify(CHARACTERISTIC_UUID, handler)
                 try:
-                    await asyncio.wait_for(done.wait(), timeout=LISTEN_SECONDS)
+                    reading = await asyncio.wait_for(fut, timeout=LISTEN_SECONDS)
                 except asyncio.TimeoutError:
                     print("Timed out waiting for a height reading.")
                     if not disconnected.is_set():
                         await client.stop_notify(CHARACTERISTIC_UUID)
                     continue
 
-                if result[0] is None:
+                if reading is None:
                     continue
 
                 if not disconnected.is_set():
@@ -87,7 +85,7 @@ async def get_reading():
             continue
 
         print("Done.")
-        return result[0]
+        return reading
 
     print(f"\nFailed to get a reading after {MAX_ATTEMPTS} attempts.")
     return None
@@ -9,6 +9,8 @@ The script will connect, wait for a stable reading, print it, then exit.
 """
 
 import asyncio
+import struct
+from collections import deque
 from datetime import datetime
 from bleak import BleakClient, BleakScanner
 
@@ -21,11 +23,18 @@ NOTIFY_CHAR_UUID = "0000ffe1-0000-1000-8000-00805f9b34fb"
 
 LISTEN_SECONDS = 60  # how long to wait for a reading before giving up
 
-# Number of consecutive matching frames required before accepting as stable
-STABLE_FRAMES_REQUIRED = 1
+# Number of consecutive valid frames required before accepting as stable
+STABLE_FRAMES_REQUIRED = 5
+
+# Max spread (max - min) allowed across those frames
+SPO2_TOLERANCE = 1
+PULSE_TOLERANCE = 2
 
 MAX_ATTEMPTS = 3
 
+# Header (ff 44), two unused bytes, SpO2, pulse
+_FRAME = struct.Struct(">HxxBB")
+
 
 def _parse_oximeter_frame(data: bytearray):
     """
@@ -38,14 +47,12 @@ def _parse_oximeter_frame(data: bytearray):
 
     Returns dict with spo2/pulse, or None if the frame is not recognised.
     """
-    if len(data) < 6:
+    if len(data) < _FRAME.size:
         return None
-    if data[0] != 0xFF or data[1] != 0x44:
+    header, spo2, pulse = _FRAME.unpack_from(data)
+    if header != 0xFF44:
         return None
 
-    spo2 = data[4]
-    pulse = data[5]
-
     # Ignore obviously invalid values (pulse=255 means no finger detected)
     if spo2 == 0 or pulse == 0 or pulse == 255 or spo2 > 100:
         return None
@@ -88,57 +95,57 @@ async def get_reading():
 
         print(f"Connecting to {device.address} ...")
         try:
-            done = asyncio.Event()
             disconnected = asyncio.Event()
-            result = [None]
             loop = asyncio.get_running_loop()
+            fut = loop.create_future()
 
             def on_disconnect(_client):
-                if result[0] is None:
+                if not fut.done():
                     print("\nDisconnected. Place the oximeter on your finger and try again.")
                     loop.call_soon_threadsafe(disconnected.set)
-                    loop.call_soon_threadsafe(done.set)
+                    fut.set_result(None)
 
             async with BleakClient(device, timeout=20.0, disconnected_callback=on_disconnect) as client:
                 print("Connected. Getting reading — keep the oximeter still on your finger.")
 
-                stable_count = [0]
-                last_reading = [None]
+                spo2_buf = deque(maxlen=STABLE_FRAMES_REQUIRED)
+                pulse_buf = deque(maxlen=STABLE_FRAMES_REQUIRED)
 
                 def handler(_sender, data: bytearray):
-                    if result[0] is not None:
+                    if fut.done():
                         return
                     reading = _parse_oximeter_frame(data)
                     if reading is None:
-                        stable_count[0] = 0
-                        last_reading[0] = None
+                        spo2_buf.clear()
+                        pulse_buf.clear()
                         return
 
-                    if reading == last_reading[0]:
-                        stable_count[0] += 1
-                    else:
-                        stable_count[0] = 1
-                        last_reading[0] = reading
+                    spo2_buf.append(reading["spo2"])
+                    pulse_buf.append(reading["pulse"])
+                    if len(spo2_buf) < STABLE_FRAMES_REQUIRED:
+                        return
 
-                    if stable_count[0] >= STABLE_FRAMES_REQUIRED:
+                    if (
+                        max(spo2_buf) - min(spo2_buf) <= SPO2_TOLERANCE
+                        and max(pulse_buf) - min(pulse_buf) <= PULSE_TOLERANCE
+                    ):
                         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                         print(
                             f"[{ts}]  SpO2 = {reading['spo2']} %    "
                             f"Pulse = {reading['pulse']} bpm"
                         )
-                        result[0] = {"spo2": reading["spo2"], "pulse": reading["pulse"]}
-                        done.set()
+                        fut.set_result({"spo2": reading["spo2"], "pulse": reading["pulse"]})
 
                 await client.start_notify(NOTIFY_CHAR_UUID, handler)
                 try:
-                    await asyncio.wait_for(done.wait(), timeout=LISTEN_SECONDS)
+                    reading = await asyncio.wait_for(fut, timeout=LISTEN_SECONDS)
                 except asyncio.TimeoutError:
                     print("Timed out. Make sure the oximeter is firmly on your finger.")
                     if not disconnected.is_set():
                         await client.stop_notify(NOTIFY_CHAR_UUID)
                     continue
 
-                if result[0] is None:
+                if reading is None:
                     continue
 
                 await client.stop_notify(NOTIFY_CHAR_UUID)
@@ -148,7 +155,7 @@ async def get_reading():
             continue
 
         print("Done.")
-        return result[0]
+        return reading
 
     print(f"\nFailed to get a reading after {MAX_ATTEMPTS} attempts.")
     return None
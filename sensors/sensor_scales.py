@@ -1,4 +1,5 @@
 import asyncio
+import struct
 
 from datetime import datetime
 
@@ -18,9 +19,7 @@ LISTEN_SECONDS = 180
 MAX_ATTEMPTS = 3
 
 
-def _parse_vitafit_frame(hexstr: str):
-    b = bytes.fromhex(hexstr)
-
+def _parse_vitafit_frame(b: bytes):
     # minimal framing checks
     if len(b) < 6 or b[0] != 0x5A:
         return None
@@ -31,7 +30,7 @@ def _parse_vitafit_frame(hexstr: str):
     # Weight frame: 5A 0A 26 10 ... ... ... ... WW WW .. ..
     if len(b) == 12 and cmd1 == 0x26 and cmd2 == 0x10:
         # bytes 8..9 are weight*100, big-endian (matches 0x1B49 -> 6985 -> 69.85 kg)
-        w_raw = int.from_bytes(b[8:10], "big")
+        (w_raw,) = struct.unpack_from(">H", b, 8)
         kg = w_raw / 100.0
         stable = b[4] == 0x02  # 0x00=starting, 0x01=measuring, 0x02=final stable
         return {"type": "weight", "kg": kg, "raw": w_raw, "len": len(b), "length": length, "stable": stable}
@@ -72,43 +71,40 @@ async def get_reading():
 
         print(f"Connecting to {addr} ...")
         try:
-            done = asyncio.Event()
             disconnected = asyncio.Event()
-            result = [None]
             connected = [False]
             loop = asyncio.get_running_loop()
+            fut = loop.create_future()
 
             def on_disconnect(_client):
-                if connected[0] and result[0] is None:
+                if connected[0] and not fut.done():
                     print("\nDisconnected. Please step on the scale.")
                     loop.call_soon_threadsafe(disconnected.set)
-                    loop.call_soon_threadsafe(done.set)
+                    fut.set_result(None)
 
             async with BleakClient(addr, timeout=20.0, disconnected_callback=on_disconnect) as client:
                 connected[0] = True
                 print("Connected. Stay still on the scale.")
 
                 def handler(_sender, data: bytearray):
-                    if result[0] is not None:
+                    if fut.done():
                         return
-                    hexstr = bytes(data).hex()
-                    decoded = _parse_vitafit_frame(hexstr)
+                    decoded = _parse_vitafit_frame(data)
                     if decoded and decoded.get("type") == "weight" and decoded.get("stable"):
                         kg = decoded["kg"]
                         print(f"Final Reading = {kg:.2f} kg")
-                        result[0] = kg
-                        done.set()
+                        fut.set_result(kg)
 
                 await client.start_notify(CHAR_FFF1, handler)
                 try:
-                    await asyncio.wait_for(done.wait(), timeout=LISTEN_SECONDS)
+                    reading = await asyncio.wait_for(fut, timeout=LISTEN_SECONDS)
                 except asyncio.TimeoutError:
                     print("Timed out waiting for a stable reading.")
                     if not disconnected.is_set():
                         await client.stop_notify(CHAR_FFF1)
                     continue
 
-                if result[0] is None:
+                if reading is None:
                     continue
 
                 await client.stop_notify(CHAR_FFF1)
@@ -118,7 +114,7 @@ async def get_reading():
             continue
 
         print("Done.")
-        return result[0]
+        return reading
 
     print(f"\nFailed to get a reading after {MAX_ATTEMPTS} attempts.")
     return None
@@ -13,9 +13,10 @@ up as user speech.
 import threading
 import time
 from multiprocessing.connection import Client
-from queue import Queue
 from typing import Optional
 
+from event_queue import EventQueue
+
 ADDRESS = ("localhost", 61000)
 """Address of the STT server."""
 
@@ -26,12 +27,12 @@ RETRY_INTERVAL = 3
 """Seconds between reconnection attempts."""
 
 _connection = None
-_action_queue: Optional[Queue] = None
+_action_queue: Optional[EventQueue] = None
 _send_lock = threading.Lock()
 _hold = False
 
 
-def init(action_queue: Queue) -> None:
+def init(action_queue: EventQueue) -> None:
     """Connect to the STT server and start the reader thread.
 
     Blocks until connected, retrying every RETRY_INTERVAL seconds.
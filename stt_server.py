@@ -1,13 +1,22 @@
 import argparse
+import functools
+import os
+import time
+from bisect import bisect_right
 from multiprocessing.connection import Connection, Listener
-from queue import Queue
+from pathlib import Path
+from queue import Empty, SimpleQueue
 from string import punctuation
 from threading import Event, Thread
 
+import ctranslate2
+import numpy as np
+
 # Import sounddevice to silence ALSA and JACK warnings:
 # https://github.com/Uberi/speech_recognition/issues/182
 import sounddevice
 import speech_recognition as sr
+from faster_whisper import WhisperModel
 
 
 ADDRESS = (HOST, PORT) = ("localhost", 61000)
@@ -31,7 +40,51 @@ STOP = "Stop STT"
 """Client command to request the server stop listening to the user."""
 
 
-HALLUCINATIONS = {
+WHISPER_MODEL = "small.en"
+"""Faster Whisper model size.
+
+Pick from the list at:
+https://github.com/openai/whisper#available-models-and-languages
+"""
+
+
+SAMPLE_RATE = 16000
+"""Sample rate (Hz) Whisper expects its input audio at."""
+
+
+MAX_UTTERANCE_SECONDS = 30
+"""Utterance length the float32 sample buffer is initially sized for."""
+
+
+ENERGY_THRESHOLD_CACHE = Path.home() / ".heartpod_energy"
+"""File the last session's energy threshold is cached in.
+
+When present, it seeds the threshold instead of the 1 second ambient
+noise calibration. Delete it to force a recalibration.
+"""
+
+
+VAD_MIN_SILENCE_MS = 400
+"""Silence (ms) Faster Whisper's Silero VAD needs to see before it cuts
+audio out of an utterance."""
+
+
+POLL_INTERVAL = 0.2
+"""Seconds the recognizer and sender threads wait on their queue before
+checking the halt event again."""
+
+
+MAX_BATCH = 8
+"""Most queued utterances transcribed together in one Whisper call."""
+
+
+BATCH_GAP_SECONDS = 1.0
+"""Silence inserted between batched utterances. Whisper may still decode
+several utterances as one segment, so words are attributed to utterances
+by their own start times, not by segment."""
+
+
+HALLUCINATIONS = frozenset({
     # Thank you phrases
     "thank you",
     "thank you very much",
@@ -45,7 +98,7 @@ HALLUCINATIONS = {
     # Filler phrases
     "you",
     "subtitles by the amara org community",
-}
+})
 """Whisper hallucinations.
 
 Sentences produced by the model when it is fed silence or very
@@ -56,24 +109,136 @@ https://huggingface.co/datasets/sachaarbonel/whisper-hallucinations
 """
 
 
+_PUNCTUATION_TO_SPACE = str.maketrans(punctuation, len(punctuation) * " ")
+
+
 def suppress_hallucinations(text: str) -> str:
     """Filter out an hallucinated sentence.
 
     Return the empty string if the input text is a known Whisper
     hallucination, otherwise return the input text.
 
-    Matching is performed in lowercase, with punctuation characters
+    Matching is performed casefolded, with punctuation characters
     replaced with a single space, and whitespace normalized.
     """
-    punctuation_to_space = str.maketrans(punctuation, len(punctuation) * " ")
     return (
         ""
-        if " ".join(text.lower().translate(punctuation_to_space).split())
+        if " ".join(text.casefold().translate(_PUNCTUATION_TO_SPACE).split())
         in HALLUCINATIONS
         else text
     )
 
 
+_whisper_model: WhisperModel | None = None
+
+
+def get_whisper_model(compute_type: str | None = None) -> WhisperModel:
+    """Return the Faster Whisper model, loading it on first use.
+
+    The model is shared by every STT instance (one per client
+    connection), so it is only loaded once per server process.
+    compute_type only matters on that first call.
+    """
+    global _whisper_model
+    if _whisper_model is None:
+        device, compute_type = whisper_device(compute_type)
+        cpus = pinned_cpus() if device == "cpu" else None
+        if cpus is None:
+            _whisper_model = WhisperModel(
+                WHISPER_MODEL, device=device, compute_type=compute_type
+            )
+        else:
+            # CTranslate2 starts its worker threads while the model loads,
+            # and they (and the OpenMP threads they start) inherit the
+            # loading thread's affinity. Pin only for the load, then
+            # restore it so this thread and the audio threads it starts
+            # later keep every core.
+            previous = os.sched_getaffinity(0)
+            try:
+                os.sched_setaffinity(0, cpus)
+            except OSError as error:
+                print(f"Could not pin Whisper to CPUs {sorted(cpus)}: {error}")
+                cpus = None
+            try:
+                _whisper_model = WhisperModel(
+                    WHISPER_MODEL, device=device, compute_type=compute_type,
+                    cpu_threads=len(cpus) if cpus else 0,
+                )
+            finally:
+                os.sched_setaffinity(0, previous)
+    return _whisper_model
+
+
+def whisper_device(compute_type: str | None = None) -> tuple[str, str]:
+    """Pick the CTranslate2 device and compute type for the Whisper model.
+
+    Unless a compute type is given, int8_float16 on a CUDA GPU, int8 on
+    CPU. CTranslate2 quantizes the weights when the model is loaded,
+    and selects the fastest kernels the CPU supports (e.g. AVX-512/VNNI)
+    at runtime.
+    """
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    default = "int8_float16" if device == "cuda" else "int8"
+    return device, compute_type or default
+
+
+def load_whisper_model(compute_type: str | None = None) -> None:
+    """Load the Whisper model and run one throwaway transcription.
+
+    Done at startup so the first real utterance doesn't pay for model
+    loading, device initialization, or workspace allocation.
+    """
+    start = time.perf_counter()
+    model = get_whisper_model(compute_type)
+    loaded = time.perf_counter()
+    device, compute_type = whisper_device(compute_type)
+    print(
+        f"Loaded Whisper model {WHISPER_MODEL} ({device}, {compute_type}) "
+        f"in {loaded - start:.1f}s"
+    )
+
+    # Once without VAD so the Whisper model itself runs (VAD would drop
+    # the silence), once with it so the VAD model is loaded too
+    silence = np.zeros(SAMPLE_RATE // 10, dtype=np.float32)
+    for vad_filter in (False, True):
+        segments, _ = model.transcribe(silence, language="en", vad_filter=vad_filter)
+        for _ in segments:
+            pass
+    print(f"Warmed up Whisper model in {time.perf_counter() - loaded:.1f}s")
+
+
+def pinned_cpus() -> set[int] | None:
+    """Return the CPUs named by HEARTPOD_PIN_CPU (e.g. "3" or "2,3").
+
+    None if the variable is unset or invalid, or on platforms without
+    sched_setaffinity (macOS, Windows).
+    """
+    value = os.environ.get("HEARTPOD_PIN_CPU")
+    if not value or not hasattr(os, "sched_setaffinity"):
+        return None
+    try:
+        return {int(cpu) for cpu in value.split(",")}
+    except ValueError:
+        print(f"Ignoring HEARTPOD_PIN_CPU={value!r}: expected CPU indices like 3 or 2,3")
+        return None
+
+
+def load_energy_threshold() -> float | None:
+    """Return the cached energy threshold, or None if there isn't one."""
+    try:
+        return float(ENERGY_THRESHOLD_CACHE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def save_energy_threshold(threshold: float) -> None:
+    """Cache the energy threshold for the next session."""
+    try:
+        ENERGY_THRESHOLD_CACHE.write_text(f"{threshold:.1f}")
+    except OSError as error:
+        print(f"Could not cache energy threshold: {error}")
+
+
 def parse_args() -> argparse.Namespace:
     """Parse the command-line arguments of this program."""
     parser = argparse.ArgumentParser(description="Speech-to-text server for HeartPod")
@@ -99,16 +264,31 @@ def parse_args() -> argparse.Namespace:
         metavar="N",
         type=int,
         help=(
-            "energy threshold for sounds (if unspecified, automatic calibration is "
-            "performed before listening and the threshold is further adjusted "
-            "automatically while listening)"
+            "energy threshold for sounds (if unspecified, the threshold cached by "
+            "the previous session is used, or automatic calibration is performed "
+            "before listening if there is none, and the threshold is further "
+            "adjusted automatically while listening)"
+        ),
+    )
+    parser.add_argument(
+        "-c",
+        "--compute-type",
+        metavar="TYPE",
+        default=os.environ.get("HEARTPOD_CT2_COMPUTE"),
+        help=(
+            "CTranslate2 compute type for the Whisper model, e.g. float16 or "
+            "float32 (if unspecified, the HEARTPOD_CT2_COMPUTE environment "
+            "variable is used, or int8_float16 on a CUDA GPU and int8 on CPU)"
         ),
     )
     parser.add_argument(
         "-v",
         "--verbose",
         action="store_true",
-        help="print everything Whisper thinks you said, including hallucinations",
+        help=(
+            "print everything Whisper thinks you said, including hallucinations, "
+            "and log every start/stop request"
+        ),
     )
     args = parser.parse_args()
 
@@ -126,14 +306,24 @@ def parse_args() -> argparse.Namespace:
     return args
 
 
+@functools.lru_cache(maxsize=1)
+def get_microphone_names() -> tuple[str, ...]:
+    """Return the names of the available microphones.
+
+    Enumerating PortAudio devices is slow, so this is only done once per
+    process. Microphones plugged in later won't be listed.
+    """
+    return tuple(sr.Microphone.list_microphone_names())
+
+
 def get_microphone_count() -> int:
     """Return the number of available microphones."""
-    return len(sr.Microphone.list_microphone_names())
+    return len(get_microphone_names())
 
 
 def list_microphones() -> None:
     """List all available microphones."""
-    for index, name in enumerate(sr.Microphone.list_microphone_names()):
+    for index, name in enumerate(get_microphone_names()):
         print(f"{index}: {name}")
 
 
@@ -150,7 +340,7 @@ class STT:
     microphone: sr.Microphone
     recognizer: sr.Recognizer
     worker: dict[str, Thread]
-    queue: dict[str, Queue]
+    queue: dict[str, SimpleQueue]
     halt: Event
     running: bool
 
@@ -164,6 +354,10 @@ class STT:
             # Either by using the value specified by the user
             self.recognizer.energy_threshold = energy_threshold
             self.recognizer.dynamic_energy_threshold = False  # Default: True
+        elif (cached := load_energy_threshold()) is not None:
+            # Or by reusing the threshold the last session ended with
+            # (it keeps adapting while listening)
+            self.recognizer.energy_threshold = cached
         else:
             # Or by listening for 1 second (by default) to calibrate the
             # energy threshold for ambient noise levels
@@ -186,6 +380,98 @@ class STT:
         # Verbosity
         self.verbose = verbose
 
+        # Scratch buffer the recognizer thread converts each utterance
+        # into, so no new float32 array is allocated per utterance
+        self.samples = np.empty(SAMPLE_RATE * MAX_UTTERANCE_SECONDS, dtype=np.float32)
+
+    def to_samples(self, batch: list[sr.AudioData]) -> tuple[np.ndarray, list[float]]:
+        """Convert captured audio to the float32 samples Whisper expects.
+
+        Utterances are laid end to end, separated by BATCH_GAP_SECONDS
+        of silence. Returns the samples (a view into self.samples, valid
+        until the next call) and the start time in seconds of each
+        utterance.
+        """
+        pcms = [
+            np.frombuffer(
+                audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2),
+                dtype=np.int16,
+            )
+            for audio in batch
+        ]
+        gap = int(SAMPLE_RATE * BATCH_GAP_SECONDS)
+        total = sum(len(pcm) for pcm in pcms) + gap * (len(pcms) - 1)
+        if total > len(self.samples):
+            self.samples = np.empty(total, dtype=np.float32)
+
+        starts = []
+        offset = 0
+        for pcm in pcms:
+            if offset:
+                self.samples[offset : offset + gap] = 0
+                offset += gap
+            starts.append(offset / SAMPLE_RATE)
+            np.multiply(
+                pcm, np.float32(1 / 32768), out=self.samples[offset : offset + len(pcm)]
+            )
+            offset += len(pcm)
+        return self.samples[:total], starts
+
+    def transcribe(self, batch: list[sr.AudioData]) -> list[str]:
+        """Transcribe one or more utterances with a single Whisper call.
+
+        Returns one string per utterance; each word is attributed to the
+        utterance whose audio it starts in. Returns an empty list if
+        Whisper failed.
+        """
+        # Perform speech recognition using Faster Whisper. The model
+        # is called directly (rather than through SpeechRecognition's
+        # recognize_faster_whisper(), which loads the model again on
+        # every call and round-trips the audio through a WAV file).
+        #
+        # Pick "language" from the full language list at:
+        #
+        # * https://github.com/SYSTRAN/faster-whisper/blob/master/faster_whisper/tokenizer.py
+        #
+        # If not set, Faster Whisper will automatically detect the
+        # language.
+        #
+        # The VAD filter strips the leading/trailing silence and noise
+        # that SpeechRecognition's energy-based phrase detection leaves
+        # in (and the gaps between batched utterances) before decoding.
+        # Timestamps still refer to the unfiltered audio. A segment can
+        # span two batched utterances (neither Whisper nor the VAD is
+        # guaranteed to cut at the gap), so word timestamps are requested
+        # and each word is assigned on its own.
+        samples, starts = self.to_samples(batch)
+        texts: list[list[str]] = [[] for _ in batch]
+        try:
+            segments, _ = get_whisper_model().transcribe(
+                samples,
+                language="en",
+                vad_filter=True,
+                vad_parameters={"min_silence_duration_ms": VAD_MIN_SILENCE_MS},
+                word_timestamps=len(batch) > 1,
+            )
+            if len(batch) == 1:
+                texts[0].extend(segment.text for segment in segments)
+            else:
+                for segment in segments:
+                    for word in segment.words:
+                        index = max(bisect_right(starts, word.start) - 1, 0)
+                        texts[index].append(word.word)
+
+        except RuntimeError as error:
+            # Whisper failed to run - is the model missing, corrupt,
+            # or otherwise incompatible?
+            print(f"Could not run Whisper: {error}")
+            return []
+
+        # Whisper starts each segment's (and word's) text with a space, so
+        # plain concatenation keeps single spacing (a lone segment is
+        # returned as is, without a copy)
+        return ["".join(text) for text in texts]
+
     def start(self, connection: Connection) -> None:
         """Start worker threads.
 
@@ -202,9 +488,10 @@ class STT:
 
         # Task queues (FIFO) for passing audio processing jobs from the
         # listener thread to the recognizer thread and text sending jobs
-        # from the recognizer thread to the sender thread
-        self.queue["audio"] = Queue()
-        self.queue["text"] = Queue()
+        # from the recognizer thread to the sender thread. Shutdown is
+        # signalled by the halt event, not by sentinels in the queues.
+        self.queue["audio"] = SimpleQueue()
+        self.queue["text"] = SimpleQueue()
 
         self.worker["listener"].start()
         self.worker["recognizer"].start()
@@ -221,8 +508,9 @@ class STT:
         if not self.running:
             return
 
-        # Stop the listener thread (the other threads are stopped in a
-        # cascade)
+        # Stop all worker threads. Each checks the event at least every
+        # POLL_INTERVAL seconds (the listener every second); anything
+        # still queued is dropped.
         self.halt.set()
 
         # Wait for all worker threads to be over
@@ -235,6 +523,10 @@ class STT:
 
         self.running = False
 
+        # Remember the adapted threshold for the next session
+        if self.recognizer.dynamic_energy_threshold:
+            save_energy_threshold(self.recognizer.energy_threshold)
+
     def listen(self) -> None:
         """Capture microphone input.
 
@@ -248,7 +540,8 @@ class STT:
             # processing job queue. Note that a stop event received
             # mid-sentence won't stop recording that sentence but will
             # stop the sentence from being processed.
-            print("Listening... Say something!")
+            if self.verbose:
+                print("Listening... Say something!")
             while True:
                 try:
                     audio = self.recognizer.listen(source, timeout=1)
@@ -260,14 +553,8 @@ class STT:
                     break
                 self.queue["audio"].put(audio)
 
-        print("Stopped listening")
-
-        # Use None as a signal to the recognizer thread that no more
-        # audio jobs are coming
-        self.queue["audio"].put(None)
-
-        # Block until all audio processing jobs are done (empty queue)
-        self.queue["audio"].join()
+        if self.verbose:
+            print("Stopped listening")
 
     def recognize(self) -> None:
         """Run speech recognition.
@@ -276,88 +563,51 @@ class STT:
         from a message queue fed by the listen() function in the
         listener thread.
         """
-        while True:
-            # Retrieve an audio processing job from the queue
-            audio = self.queue["audio"].get()
-
-            # Stop all audio processing when told that no more audio
-            # jobs are coming
-            if audio is None:
-                self.queue["audio"].task_done()
-                break
+        while not self.halt.is_set():
+            # Retrieve an audio processing job from the queue, plus any
+            # others that queued up while the previous batch was being
+            # transcribed, so they share one Whisper call
+            try:
+                batch = [self.queue["audio"].get(timeout=POLL_INTERVAL)]
+            except Empty:
+                continue
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self.queue["audio"].get_nowait())
+                except Empty:
+                    break
 
             # Don't bother performing speech recognition if the stop
             # event is on
-            if self.halt.is_set():
-                self.queue["audio"].task_done()
-                continue
-
-            # Perform speech recognition using (Faster) Whisper
-            #
-            # SpeechRecognition provides:
-            #
-            # * sr.Recognizer.recognize_whisper(...)
-            # * sr.Recognizer.recognize_faster_whisper(...)
-            #
-            # Pick "model" from the output of:
-            #
-            # >>> import whisper
-            # >>> print(whisper.available_models())
-            #
-            # Default is "base". See also:
-            #
-            # * https://github.com/openai/whisper#available-models-and-languages
-            #
-            # Pick "language" from the full language list at:
-            #
-            # * https://github.com/openai/whisper/blob/main/whisper/tokenizer.py
-            # * https://github.com/SYSTRAN/faster-whisper/blob/master/faster_whisper/tokenizer.py
-            #
-            # If not set, (Faster) Whisper will automatically detect the
-            # language.
-            try:
-                utterance = self.recognizer.recognize_faster_whisper(  # type: ignore[attr-defined]
-                    audio, model="small.en", language="en"
-                )
+            if not self.halt.is_set():
+                for utterance in self.transcribe(batch):
+                    self.handle_utterance(utterance)
 
-            except sr.UnknownValueError:
-                # Speech was unintelligible
-                print("Whisper could not understand audio")
+        if self.verbose:
+            print("Stopped recognizing speech")
 
-            except sr.RequestError as error:
-                # Whisper was unreachable or unresponsive - is it missing,
-                # corrupt, or otherwise incompatible?
-                print(f"Could not request results from Whisper: {error}")
+    def handle_utterance(self, utterance: str) -> None:
+        """Filter one transcribed utterance and queue it for sending."""
+        # Remove leading whitespace inserted by Whisper
+        utterance = utterance.lstrip()
 
-            else:
-                # Remove leading whitespace inserted by Whisper
-                utterance = utterance.lstrip()
-
-                # Reject hallucinations
-                if suppress_hallucinations(utterance) == "":
-                    if self.verbose:
-                        print(f"Rejected: {utterance}")
-                    continue
-
-                # Put the recognized speech on the sending queue, unless
-                # a stop event was received during speech recognition,
-                # in which case the recognized speech shouldn't be sent
-                print(f"Recognized: {utterance}")
-                if not self.halt.is_set():
-                    self.queue["text"].put(utterance)
-
-            finally:
-                # Mark the audio processing job as completed in the queue
-                self.queue["audio"].task_done()
-
-        print("Stopped recognizing speech")
+        if not utterance:
+            # Speech was unintelligible
+            print("Whisper could not understand audio")
+            return
 
-        # Use None as a signal to the sender thread that no more
-        # recognized speech is coming
-        self.queue["text"].put(None)
+        # Reject hallucinations
+        if suppress_hallucinations(utterance) == "":
+            if self.verbose:
+                print(f"Rejected: {utterance}")
+            return
 
-        # Block until all sending jobs are done (empty queue)
-        self.queue["text"].join()
+        # Put the recognized speech on the sending queue, unless a stop
+        # event was received during speech recognition, in which case
+        # the recognized speech shouldn't be sent
+        print(f"Recognized: {utterance}")
+        if not self.halt.is_set():
+            self.queue["text"].put(utterance)
 
     def send(self, connection: Connection) -> None:
         """Send recognized speech to connected client.
@@ -366,20 +616,16 @@ class STT:
         from a message queue fed by the recognize() function in the
         recognizer thread.
         """
-        while True:
+        while not self.halt.is_set():
             # Retrieve recognized speech from the queue
-            utterance = self.queue["text"].get()
-
-            # Stop all sending when told that no more recognized speech
-            # is coming
-            if utterance is None:
-                self.queue["text"].task_done()
-                break
+            try:
+                utterance = self.queue["text"].get(timeout=POLL_INTERVAL)
+            except Empty:
+                continue
 
             # Don't bother sending anything if the stop event is on
             if self.halt.is_set():
-                self.queue["text"].task_done()
-                continue
+                break
 
             # Send recognized speech over the connection
             try:
@@ -388,10 +634,9 @@ class STT:
                 print(f"Could not send utterance to client: {error}")
             else:
                 print(f"Sent to client: {utterance}")
-            finally:
-                self.queue["text"].task_done()
 
-        print("Stopped sending recognized speech to client")
+        if self.verbose:
+            print("Stopped sending recognized speech to client")
 
 
 def main():
@@ -403,6 +648,8 @@ def main():
         list_microphones()
         return
 
+    load_whisper_model(args.compute_type)
+
     # Listen for incoming connections
     with Listener(ADDRESS) as listener:
         print(f"Listening for connections on {listener.address}")
@@ -427,7 +674,8 @@ def main():
                             break
 
                         else:
-                            print(f"Request received: {request}")
+                            if args.verbose:
+                                print(f"Request received: {request}")
 
                             if request == START:
                                 stt.start(connection)
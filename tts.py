@@ -16,8 +16,17 @@ Local mode requires:
   Run `python download_voice.py` to fetch the voice model automatically.
 
 Playback backends (local mode):
-  macOS – afplay subprocess reading a temp WAV file
-  Linux – aplay subprocess reading WAV from stdin
+  macOS – afplay subprocess reading the disk-cached WAV, or a temp WAV file
+  Linux – aplay subprocess reading raw PCM from stdin; speech that is not
+          already cached is streamed chunk by chunk while piper is still
+          synthesising, so playback starts after the first chunk
+
+Synthesis (local mode) runs on a single background worker and results are
+kept in a small LRU cache, so prefetch() can synthesise the next page's
+speech while the user is still on the current one. The WAV for each fixed
+prompt registered with keep_on_disk() is also written to voices/cache/, so
+those stay warm across restarts; anything else (e.g. messages containing a
+reading) is only ever held in memory.
 
 ASR control:
   speak() stops the external STT server for the duration of playback.
@@ -26,28 +35,44 @@ ASR control:
   arrives from the Android app.
 """
 
-import io
+import hashlib
 import os
+import queue
+import struct
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import stt
 from ws_server import broadcast_tts, broadcast_tts_active
 
 _mode: str = "none"
 _voice = None           # piper.voice.PiperVoice, loaded once at init
-_stop_flag = threading.Event()
+_np = None              # numpy, imported at init in local mode
+_stopped = False        # set by stop(); only ever read, never waited on
 _seq_lock = threading.Lock()
 _current_seq: int = 0   # incremented on every stop(); threads bail if stale
 _proc_lock = threading.Lock()
 _current_proc = None    # current afplay/aplay subprocess
 
+# Synthesised WAV bytes keyed by text; values are Futures so a prefetch still
+# in progress is simply waited on. One worker keeps requests in FIFO order.
+_CACHE_SIZE = 32
+_synth_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-synth")
+_cache: "OrderedDict[str, Future]" = OrderedDict()
+_cache_lock = threading.Lock()
+
 _VOICES_DIR = os.path.join(os.path.dirname(__file__), "voices")
 _PIPER_MODEL = os.path.join(_VOICES_DIR, "en_GB-alba-medium.onnx")
+# Written by quantize_voice.py; used instead of _PIPER_MODEL when present.
+_PIPER_MODEL_INT8 = os.path.join(_VOICES_DIR, "en_GB-alba-medium.int8.onnx")
+_voice_model = _PIPER_MODEL  # the model file actually loaded
+_DISK_CACHE_DIR = os.path.join(_VOICES_DIR, "cache")
+_disk_texts: frozenset = frozenset()  # set by keep_on_disk()
 
 
 def mode() -> str:
@@ -57,7 +82,7 @@ def mode() -> str:
 
 def init(mode: str) -> None:
     """Validate mode and load resources. Call once before speak()."""
-    global _mode, _voice
+    global _mode, _voice, _voice_model, _np
     if mode == "local":
         if not os.path.isfile(_PIPER_MODEL):
             print(f"  [TTS: local unavailable — voice model not found: {_PIPER_MODEL}]")
@@ -65,11 +90,20 @@ def init(mode: str) -> None:
             _mode = "none"
             return
         try:
+            import numpy
             from piper.voice import PiperVoice
-            _voice = PiperVoice.load(_PIPER_MODEL)
+            _np = numpy
+            if os.path.isfile(_PIPER_MODEL_INT8):
+                _voice_model = _PIPER_MODEL_INT8
+            # The quantized model shares the original's voice config.
+            _voice = PiperVoice.load(_voice_model, config_path=_PIPER_MODEL + ".json")
             _mode = "local"
             backend = "afplay" if sys.platform == "darwin" else "aplay"
-            print(f"  [TTS: local (piper-tts, alba voice, {_voice.config.sample_rate} Hz, {backend})]")
+            voice = "alba voice, int8" if _voice_model == _PIPER_MODEL_INT8 else "alba voice"
+            print(f"  [TTS: local (piper-tts, {voice}, {_voice.config.sample_rate} Hz, {backend})]")
+            # Queued ahead of any speak(), so the first real utterance does not
+            # pay for onnxruntime's first-run graph setup.
+            _synth_pool.submit(_warm_up)
         except ImportError:
             print("  [TTS: local unavailable — run `pip install piper-tts`]")
             _mode = "none"
@@ -82,26 +116,46 @@ def init(mode: str) -> None:
 
 def speak(text: str) -> None:
     """Start speaking text, interrupting any speech already in progress."""
-    global _current_seq
+    global _current_seq, _stopped
     if _mode == "local":
         stt.stop()
         stop()
-        _stop_flag.clear()
+        _stopped = False
         with _seq_lock:
             _current_seq += 1
             seq = _current_seq
         broadcast_tts_active(True)
-        threading.Thread(target=_speak_local, args=(text, seq), daemon=True).start()
+        # Queue synthesis here (not in the thread) so it is ahead of any
+        # prefetch() the caller issues next.
+        sink = None if sys.platform == "darwin" else queue.SimpleQueue()
+        synthesis = _synthesis(text, sink)
+        threading.Thread(
+            target=_speak_local, args=(text, synthesis, sink, seq), daemon=True
+        ).start()
     elif _mode == "temi":
         stt.stop()
         broadcast_tts(text)
         # STT is restarted by ws_server.py when tts_status=stop arrives from the app.
 
 
+def prefetch(text: str) -> None:
+    """Start synthesising text in the background so a later speak(text) can
+    play it without waiting. No-op outside local mode."""
+    if _mode == "local" and text:
+        _synthesis(text)
+
+
+def keep_on_disk(texts) -> None:
+    """Register the fixed prompts whose synthesised audio may be cached in
+    voices/cache/. Call once at startup with every static page speech."""
+    global _disk_texts
+    _disk_texts = frozenset(texts)
+
+
 def stop() -> None:
     """Interrupt any speech currently in progress."""
-    global _current_seq
-    _stop_flag.set()
+    global _current_seq, _stopped
+    _stopped = True
     with _seq_lock:
         _current_seq += 1
     with _proc_lock:
@@ -112,34 +166,133 @@ def stop() -> None:
                 pass
 
 
-def _speak_local(text: str, seq: int) -> None:
-    """Worker: synthesise with piper, then play audio."""
-    import numpy as np
+def _synthesis(text: str, sink: "queue.SimpleQueue" = None) -> Future:
+    """Return the cached (possibly still running) synthesis of text, starting it if needed.
+
+    If sink is given and synthesis starts now, each chunk's raw PCM is also put
+    on sink as it is produced; either way sink ends with None.
+    """
+    with _cache_lock:
+        future = _cache.get(text)
+        if future is None:
+            future = _synth_pool.submit(_synthesize, text, sink)
+            _cache[text] = future
+            if len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        else:
+            _cache.move_to_end(text)
+            if sink is not None:
+                sink.put(None)
+    return future
+
+
+def _disk_path(text: str):
+    """Where text's WAV lives in the disk cache, or None if it is not kept there."""
+    if text not in _disk_texts:
+        return None
+    key = hashlib.sha1(f"{os.path.basename(_voice_model)}\n{text}".encode()).hexdigest()
+    return os.path.join(_DISK_CACHE_DIR, key + ".wav")
+
+
+def _wav_header(data_size: int, sample_rate: int) -> bytes:
+    """44-byte RIFF header for mono 16-bit PCM (what the wave module writes)."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size,
+    )
+
+
+def _to_int16(audio):
+    """Scale float audio in [-1, 1] to int16, reusing audio as the scratch buffer."""
+    _np.multiply(audio, 32767, out=audio)
+    _np.clip(audio, -32768, 32767, out=audio)
+    return audio.astype(_np.int16)
+
+
+def _warm_up() -> None:
+    """Run one throw-away synthesis so the ONNX session is fully initialised."""
+    try:
+        for _ in _voice.synthesize("Hello."):
+            pass
+    except Exception as e:
+        print(f"  [TTS: warm-up failed: {e}]")
+
+
+def _synthesize(text: str, sink: "queue.SimpleQueue" = None):
+    """Return text as WAV bytes, from the disk cache or by synthesising it with
+    piper; None if piper produced no audio. See _synthesis() for sink."""
     try:
-        if _stop_flag.is_set():
+        path = _disk_path(text)
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except OSError:
+                pass
+
+        pcm = []
+        for chunk in _voice.synthesize(text):
+            data = _to_int16(chunk.audio_float_array).tobytes()
+            pcm.append(data)
+            if sink is not None:
+                sink.put(data)
+    finally:
+        if sink is not None:
+            sink.put(None)
+    if not pcm:
+        return None
+
+    data = b"".join(pcm)
+    wav_bytes = _wav_header(len(data), _voice.config.sample_rate) + data
+
+    if path is not None:
+        # Best effort: write then rename so a crash never leaves a truncated file.
+        try:
+            os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(wav_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  [TTS: could not write audio cache: {e}]")
+    return wav_bytes
+
+
+def _speak_local(text: str, synthesis: Future, sink, seq: int) -> None:
+    """Worker: stream the audio as it is synthesised, or wait for the finished
+    synthesis and play it."""
+    try:
+        if _stopped:
             return
 
+        streamed = sink is not None and _stream_aplay(sink, seq)
+
         try:
-            chunks = [chunk.audio_float_array for chunk in _voice.synthesize(text)]
+            wav_bytes = synthesis.result()
         except Exception as e:
             print(f"  [TTS synthesis error: {e}]")
+            with _cache_lock:
+                if _cache.get(text) is synthesis:
+                    del _cache[text]
             return
 
-        if not chunks:
+        if wav_bytes is None:
             print("  [TTS: synthesis produced no audio]")
             return
+        if streamed:
+            return
 
         with _seq_lock:
             current = _current_seq
-        if _stop_flag.is_set() or seq != current:
+        if _stopped or seq != current:
             return
 
-        audio = np.concatenate(chunks)  # float32, range [-1, 1]
-
         if sys.platform == "darwin":
-            _play_macos(audio, seq)
+            _play_macos(wav_bytes, seq, _disk_path(text))
         else:
-            _play_aplay(audio, seq)
+            _play_aplay(wav_bytes, seq)
 
     finally:
         # Unlock the frontend and restart STT when playback ends.
@@ -151,54 +304,23 @@ def _speak_local(text: str, seq: int) -> None:
                 stt.start()
 
 
-def _play_macos(audio, seq: int) -> None:
-    """Write a temp WAV file and play via afplay (macOS).
+def _play_macos(wav_bytes: bytes, seq: int, path: str = None) -> None:
+    """Play via afplay (macOS): straight from the disk-cache copy at path if
+    there is one, otherwise from a temp WAV file.
 
     Using a file rather than stdin avoids the PortAudio conflict that arises
     when sounddevice (TTS) and pyaudio (sr.Microphone) both initialise the
     CoreAudio backend simultaneously.
     """
-    global _current_proc
-    import numpy as np
-
-    audio_int16 = (audio * 32767).clip(-32768, 32767).astype(np.int16)
-
-    buf = io.BytesIO()
-    with wave.open(buf, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(_voice.config.sample_rate)
-        wf.writeframes(audio_int16.tobytes())
+    if path is not None and os.path.isfile(path):
+        _afplay(path)
+        return
 
     tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
     try:
-        tmp.write(buf.getvalue())
+        tmp.write(wav_bytes)
         tmp.close()
-
-        try:
-            proc = subprocess.Popen(
-                ["afplay", tmp.name],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        except FileNotFoundError:
-            print("  [TTS: afplay not found]")
-            return
-
-        with _proc_lock:
-            _current_proc = proc
-
-        try:
-            proc.wait(timeout=60)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait()
-        except Exception:
-            pass
-        finally:
-            with _proc_lock:
-                if _current_proc is proc:
-                    _current_proc = None
+        _afplay(tmp.name)
     finally:
         try:
             os.unlink(tmp.name)
@@ -206,24 +328,48 @@ def _play_macos(audio, seq: int) -> None:
             pass
 
 
-def _play_aplay(audio, seq: int) -> None:
-    """Encode to WAV and pipe to aplay (Linux)."""
+def _afplay(path: str) -> None:
     global _current_proc
-    import numpy as np
 
-    audio_int16 = (audio * 32767).clip(-32768, 32767).astype(np.int16)
+    try:
+        proc = subprocess.Popen(
+            ["afplay", path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        print("  [TTS: afplay not found]")
+        return
+
+    with _proc_lock:
+        _current_proc = proc
+
+    try:
+        proc.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    except Exception:
+        pass
+    finally:
+        with _proc_lock:
+            if _current_proc is proc:
+                _current_proc = None
+
+
+def _aplay_raw_cmd() -> list:
+    """aplay argv for headerless mono 16-bit PCM at the voice's sample rate."""
+    return ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1",
+            "-r", str(_voice.config.sample_rate), "-"]
 
-    buf = io.BytesIO()
-    with wave.open(buf, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(_voice.config.sample_rate)
-        wf.writeframes(audio_int16.tobytes())
-    wav_bytes = buf.getvalue()
+
+def _play_aplay(wav_bytes: bytes, seq: int) -> None:
+    """Pipe the PCM from WAV bytes to aplay in raw mode (Linux)."""
+    global _current_proc
 
     try:
         proc = subprocess.Popen(
-            ["aplay", "-q", "-"],
+            _aplay_raw_cmd(),
             stdin=subprocess.PIPE,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
@@ -236,7 +382,8 @@ def _play_aplay(audio, seq: int) -> None:
         _current_proc = proc
 
     try:
-        proc.stdin.write(wav_bytes)
+        # Our WAVs always carry the fixed 44-byte header from _wav_header().
+        proc.stdin.write(memoryview(wav_bytes)[44:])
         proc.stdin.close()
         proc.wait(timeout=60)
     except subprocess.TimeoutExpired:
@@ -248,3 +395,51 @@ def _play_aplay(audio, seq: int) -> None:
         with _proc_lock:
             if _current_proc is proc:
                 _current_proc = None
+
+
+def _stream_aplay(sink: "queue.SimpleQueue", seq: int) -> bool:
+    """Pipe raw PCM chunks from sink to aplay as they arrive (Linux).
+
+    Returns False without playing anything if sink carries no chunks (the
+    audio was already cached or still being prefetched).
+    """
+    global _current_proc
+
+    data = sink.get()
+    if data is None:
+        return False
+
+    try:
+        proc = subprocess.Popen(
+            _aplay_raw_cmd(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        print("  [TTS: aplay not found — install alsa-utils]")
+        return True
+
+    with _proc_lock:
+        _current_proc = proc
+
+    try:
+        while data is not None:
+            with _seq_lock:
+                current = _current_seq
+            if _stopped or seq != current:
+                proc.kill()
+                break
+            proc.stdin.write(data)
+            proc.stdin.flush()
+            data = sink.get()
+        proc.stdin.close()
+        proc.wait(timeout=60)
+    except Exception:  # timeout, or the pipe broke because stop() killed aplay
+        proc.kill()
+        proc.wait()
+    finally:
+        with _proc_lock:
+            if _current_proc is proc:
+                _current_proc = None
+    return True
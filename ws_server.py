@@ -14,7 +14,6 @@ understands; questionnaire answers are passed through as-is.
 
 import asyncio
 import json
-import queue
 import threading
 from typing import Optional, Set
 
@@ -22,15 +21,53 @@ import websockets
 from websockets.server import WebSocketServerProtocol
 
 import stt
+from event_queue import EventQueue
+
+try:
+    import uvloop  # faster drop-in event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson  # Rust JSON codec; output is already compact
+except ImportError:
+    orjson = None
 
 DEFAULT_PORT = 8000
 
-# Last-known state — sent immediately to any newly connected client.
-_ws_state: dict = {"page_id": 1, "data": {}}
+# Seconds a single client may take to accept a message before it is dropped.
+_SEND_TIMEOUT = 2.0
+
+
+if orjson is not None:
+
+    def _encode(message: dict) -> str:
+        """Serialise an outgoing message as compact JSON."""
+        # Decoded back to str so websockets still sends a text frame.
+        return orjson.dumps(message).decode()
+
+    _decode = orjson.loads  # orjson.JSONDecodeError subclasses json's
+
+else:
+
+    def _encode(message: dict) -> str:
+        """Serialise an outgoing message as compact JSON (no spaces after separators)."""
+        return json.dumps(message, separators=(",", ":"))
+
+    _decode = json.loads
+
+
+# Last-known state message, already JSON-encoded — sent as-is to any newly
+# connected client. Rebound (never mutated) by update_state().
+_ws_state_msg: str = _encode({"type": "state", "page_id": 1, "data": {}})
+
+# True while a _push_state() callback is scheduled on the loop; further
+# update_state() calls before it runs only replace _ws_state_msg.
+_state_push_pending: bool = False
 
 # Actions from connected clients (and terminal) are placed here;
 # robot._ask_user() blocks on this queue.
-action_queue: queue.Queue = queue.Queue()
+action_queue: EventQueue = EventQueue()
 
 # Set when the user requests a full reset; checked independently of the queue
 # so it survives flush_action_queue() calls during page transitions.
@@ -59,16 +96,17 @@ _ACTION_TEXT = {
     "exit":     "no",
     "finish":   "done",
 }
+_action_text = _ACTION_TEXT.get  # bound once; used on every incoming action
 
 
 async def _handler(websocket: WebSocketServerProtocol):
     """Handle a single WebSocket connection."""
     _clients.add(websocket)
     try:
-        await websocket.send(json.dumps({"type": "state", **_ws_state}))
+        await websocket.send(_ws_state_msg)
         async for raw in websocket:
             try:
-                msg = json.loads(raw)
+                msg = _decode(raw)
             except json.JSONDecodeError:
                 continue
             msg_type = msg.get("type", "action")
@@ -99,14 +137,14 @@ async def _handler(websocket: WebSocketServerProtocol):
                 continue
 
             if action == "reset":
-                reset_event.set()
+                request_reset()
                 print("\n  [app] reset requested")
                 continue
 
             if action == "answer":
                 text = data.get("answer", action)
             else:
-                text = _ACTION_TEXT.get(action, action)
+                text = _action_text(action, action)
             if text:
                 action_queue.put(text)
                 print(f"\n  [app] '{text}'" + (f"  ({action})" if action != text else ""))
@@ -119,46 +157,99 @@ async def _handler(websocket: WebSocketServerProtocol):
 async def _broadcast(message: str):
     """Send a message to all connected clients."""
     if _clients:
-        await asyncio.gather(
-            *(c.send(message) for c in set(_clients)),
-            return_exceptions=True,
-        )
+        # The generator is unpacked before gather() yields to the loop, so
+        # _clients cannot change underneath it and needs no copy.
+        await asyncio.gather(*(_send(c, message) for c in _clients))
+
+
+async def _send(client: WebSocketServerProtocol, message: str):
+    """Send to one client, dropping it if it cannot keep up."""
+    try:
+        await asyncio.wait_for(client.send(message), _SEND_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Messages are tiny, so a send only blocks once the socket buffer is
+        # full. Abort rather than let sends pile up; the app reconnects and
+        # is sent the current state.
+        print("\n  [ws] client not keeping up — disconnecting it")
+        _clients.discard(client)
+        client.transport.abort()
+    except Exception:
+        pass  # connection already closing; _handler removes it
 
 
 async def _serve(port: int):
-    async with websockets.serve(_handler, "0.0.0.0", port):
+    # Messages are small JSON blobs; per-message deflate costs more CPU than it
+    # saves. The app never reads the Server header, so don't send one.
+    # Incoming frames are button presses of a few dozen bytes, so cap them at
+    # 4 KB instead of the 1 MiB default.
+    async with websockets.serve(
+        _handler, "0.0.0.0", port,
+        compression=None, server_header=None, max_size=4096,
+    ):
         await asyncio.Future()  # run until cancelled
 
 
-def update_state(page_id: int, data: dict):
-    """Push the current page to all connected clients."""
-    global _ws_state
-    _ws_state = {"page_id": page_id, "data": data}
+def event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the server's event loop if it is running, else None.
+
+    Other modules (e.g. device.py) schedule their async work on this loop so
+    the whole app shares a single asyncio event loop.
+    """
     if _loop and _loop.is_running():
-        msg = json.dumps({"type": "state", "page_id": page_id, "data": data})
-        asyncio.run_coroutine_threadsafe(_broadcast(msg), _loop)
+        return _loop
+    return None
+
+
+def update_state(page_id: int, data: dict):
+    """Push the current page to all connected clients.
+
+    Back-to-back calls made before the loop gets to the push are coalesced:
+    clients receive only the latest state.
+    """
+    global _ws_state_msg, _state_push_pending
+    _ws_state_msg = _encode({"type": "state", "page_id": page_id, "data": data})
+    if _loop and _loop.is_running() and not _state_push_pending:
+        _state_push_pending = True
+        _loop.call_soon_threadsafe(_push_state)
+
+
+def _push_state():
+    """Broadcast whatever _ws_state_msg is now (runs on the event loop)."""
+    global _state_push_pending
+    _state_push_pending = False
+    _loop.create_task(_broadcast(_ws_state_msg))
+
+
+def request_reset():
+    """Abandon the current session: set reset_event and wake the robot if it
+    is blocked waiting for an action."""
+    reset_event.set()
+    action_queue.wake()
 
 
 def flush_action_queue():
     """Discard any actions queued before the current page transition."""
-    while not action_queue.empty():
-        try:
-            action_queue.get_nowait()
-        except queue.Empty:
-            break
+    action_queue.drain()
 
 
 def broadcast_tts(text: str):
     """Send a TTS utterance to all connected clients (temi mode)."""
     if _loop and _loop.is_running():
-        msg = json.dumps({"type": "tts", "text": text})
+        msg = _encode({"type": "tts", "text": text})
         asyncio.run_coroutine_threadsafe(_broadcast(msg), _loop)
 
 
+# Only two possible payloads, so encode them once.
+_TTS_ACTIVE_MSG = {
+    True: _encode({"type": "tts_active", "active": True}),
+    False: _encode({"type": "tts_active", "active": False}),
+}
+
+
 def broadcast_tts_active(active: bool):
     """Notify clients that local TTS playback is starting (True) or finished (False)."""
     if _loop and _loop.is_running():
-        msg = json.dumps({"type": "tts_active", "active": active})
+        msg = _TTS_ACTIVE_MSG[active]
         asyncio.run_coroutine_threadsafe(_broadcast(msg), _loop)
 
 
@@ -175,7 +266,7 @@ class _ServerHandle:
 def start_ws_server(port: int = DEFAULT_PORT) -> _ServerHandle:
     """Start the WebSocket server in a background daemon thread."""
     global _loop
-    _loop = asyncio.new_event_loop()
+    _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
 
     def _run():
         asyncio.set_event_loop(_loop)